@@ -1,33 +1,81 @@
+import os
 import re
+import shutil
+import sys
+from functools import lru_cache
 from setuptools import setup, find_packages
+from setuptools.command.build_py import build_py
+
+# Prefer a real TOML parser; fall back to regex scanning on interpreters
+# where neither tomllib (3.11+) nor tomli is importable (e.g. old pip builds).
+try:
+    if sys.version_info >= (3, 11):
+        import tomllib
+    else:
+        import tomli as tomllib
+except ImportError:
+    tomllib = None
+
+# pyproject.toml is read and parsed a single time, however many keys are requested
+@lru_cache(maxsize=1)
+def _load_config():
+    with open("pyproject.toml", "rb") as f:
+        return tomllib.load(f)
+
+@lru_cache(maxsize=1)
+def _read_config_bytes():
+    # Matched as raw bytes: only the captured value is ever decoded
+    with open("pyproject.toml", "rb") as f:
+        content = f.read()
+    
+    # Remove BOM if present
+    if content.startswith(b'\xef\xbb\xbf'):
+        content = content[3:]
+    return content
+
+# Regex fallback patterns, compiled once per section/key
+_NEXT_SECTION_RE = re.compile(rb'^\[', re.MULTILINE)
+
+@lru_cache(maxsize=None)
+def _section_pattern(section):
+    return re.compile(rb'^\[' + re.escape(section.encode()) + rb'\]', re.MULTILINE)
+
+@lru_cache(maxsize=None)
+def _key_pattern(key):
+    return re.compile(rb'^' + re.escape(key.encode()) + rb'[ \t]*=[ \t]*["\']([^"\']+)["\']', re.MULTILINE)
+
+def _search_config_value(section, key, default):
+    content = _read_config_bytes()
+    
+    # Cheap substring checks reject missing sections/keys before any regex runs
+    if f'[{section}]'.encode() not in content:
+        return default
+    
+    # Find section
+    section_match = _section_pattern(section).search(content)
+    if not section_match:
+        return default
+        
+    # Find key in content after section
+    start = section_match.end()
+    # Find next section or end of file
+    next_section = _NEXT_SECTION_RE.search(content, start)
+    end = next_section.start() if next_section else len(content)
+    
+    if content.find(key.encode(), start, end) < 0:
+        return default
+    
+    # Find key, scanning the section in place rather than slicing it out
+    key_match = _key_pattern(key).search(content, start, end)
+    if key_match:
+        return key_match.group(1).decode('utf-8')
+    return default
 
 def get_config_value(section, key, default):
     try:
-        with open("pyproject.toml", "r", encoding="utf-8") as f:
-            content = f.read()
-        
-        # Remove BOM if present
-        if content.startswith('\ufeff'):
-            content = content[1:]
-        
-        # Find section
-        section_match = re.search(f'^\\[{section}\\]', content, re.MULTILINE)
-        if not section_match:
-            return default
-            
-        # Find key in content after section
-        start = section_match.end()
-        # Find next section or end of file
-        next_section = re.search(r'^\[', content[start:], re.MULTILINE)
-        end = start + next_section.start() if next_section else len(content)
-        
-        section_content = content[start:end]
-        
-        # Find key
-        key_match = re.search(f'^{key}\\s*=\\s*["\']([^"\']+)["\']', section_content, re.MULTILINE)
-        if key_match:
-            return key_match.group(1)
-            
+        if tomllib is None:
+            return _search_config_value(section, key, default)
+        return _load_config().get(section, {}).get(key, default)
     except Exception:
         pass
     return default
@@ -38,10 +86,6 @@ PACKAGE_VERSION = get_config_value("project", "version", "0.1.0")
 CUSTOM_SHORTCUT = get_config_value("custom-build", "shortcut", "dya")
 CUSTOM_NAME = get_config_value("custom-build", "name", "DYNAMIC ALIAS")
 
-from setuptools.command.build_py import build_py
-import shutil
-import os
-
 class CustomBuildPy(build_py):
     def run(self):
         # 1. Copy config
@@ -61,7 +105,8 @@ class CustomBuildPy(build_py):
         finally:
             # 3. Cleanup
             if copied:
-                if os.path.exists(dst_config):
+                # Only remove the regular file this build wrote
+                if os.path.isfile(dst_config) and not os.path.islink(dst_config):
                     print(f"Cleaning up bundled config: {dst_config}")
                     os.remove(dst_config)
 
@@ -1,42 +1,88 @@
 import os
 import json
 import time
+from contextlib import contextmanager
 from typing import Dict, List, Any, Optional
 
 from .constants import (
     CACHE_KEY_HISTORY, CACHE_KEY_LOCALS, 
-    CACHE_KEY_TIMESTAMP, CACHE_KEY_DATA
+    CACHE_KEY_TIMESTAMP, CACHE_KEY_DATA, CACHE_KEY_TTL
 )
 
+# Compact stdlib json in binary mode: the file stays plain JSON, readable
+# and editable by hand, and every value json accepts round-trips unchanged
+def _dumps(obj: Any) -> bytes:
+    return json.dumps(obj, separators=(',', ':')).encode('utf-8')
+
+
+_loads = json.loads
+
 
 class CacheManager:
     """Manages cache persistence for dynamic dicts, history, and locals."""
+
+    __slots__ = ('cache_file', 'enabled', 'cache', '_saved', '_dirty', '_batch_depth')
     
     def __init__(self, cache_file: str, enabled: bool):
         self.cache_file = cache_file
         self.enabled = enabled
         self.cache: Dict[str, Any] = {}
+        # The dict last loaded or saved; assigning a new dict to cache counts as a change
+        self._saved = self.cache
+        # True when memory differs from disk; save() is a no-op otherwise
+        self._dirty = False
+        # >0 while inside batch(); saves are deferred to the outermost exit
+        self._batch_depth = 0
 
     def load(self) -> None:
         """Load cache from disk."""
         if not self.enabled:
             return
-        if os.path.exists(self.cache_file):
-            try:
-                with open(self.cache_file, 'r') as f:
-                    self.cache = json.load(f)
-            except Exception as e:
-                print(f"Warning: Failed to load cache: {e}")
+        try:
+            with open(self.cache_file, 'rb') as f:
+                self.cache = self._saved = _loads(f.read())
+        except FileNotFoundError:
+            pass  # No cache yet
+        except Exception as e:
+            print(f"Warning: Failed to load cache: {e}")
 
     def save(self) -> None:
-        """Save cache to disk."""
-        if not self.enabled:
+        """Save cache to disk (skipped when nothing changed since the last load/save)."""
+        if not self.enabled or self._batch_depth:
+            return
+        if not self._dirty and self.cache is self._saved:
             return
+        # Write a sibling temp file and swap it in, so an interrupted save
+        # (or a concurrent reader) never sees a half-written cache.
+        # Resolve symlinks first so a linked cache file is updated, not replaced
+        target = os.path.realpath(self.cache_file)
+        tmp_file = f"{target}.{os.getpid()}.tmp"
         try:
-            with open(self.cache_file, 'w') as f:
-                json.dump(self.cache, f, indent=2)
+            data = _dumps(self.cache)
+            # Owner-only: the cache holds locals captured from command output
+            fd = os.open(tmp_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_file, target)
+            self._saved = self.cache
+            self._dirty = False
         except Exception as e:
             print(f"Warning: Failed to save cache: {e}")
+            try:
+                os.remove(tmp_file)
+            except OSError:
+                pass
+
+    @contextmanager
+    def batch(self):
+        """Group several mutations into a single save() when the block exits."""
+        self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            self._batch_depth -= 1
+            if not self._batch_depth:
+                self.save()
 
     def get(self, key: str, ttl: int = 300) -> Optional[List[Dict[str, Any]]]:
         """Get cached data if not expired."""
@@ -47,43 +93,51 @@ class CacheManager:
         if not entry or not isinstance(entry, dict):
             return None
             
-        timestamp = entry.get(CACHE_KEY_TIMESTAMP, 0)
         data = entry.get(CACHE_KEY_DATA)
         
         if data is None:
             return None
             
-        current_time = int(time.time())
-        if current_time - timestamp > ttl:
-            return None  # Expired
+        if self._expired(entry, ttl, int(time.time())):
+            return None
             
         return data
 
-    def set(self, key: str, value: List[Dict[str, Any]]) -> None:
-        """Set cache entry with timestamp."""
+    @staticmethod
+    def _expired(entry: Dict[str, Any], ttl: int, now: int) -> bool:
+        """True when entry is older than ttl, or than its own (shorter) TTL, e.g. failed sources."""
+        entry_ttl = entry.get(CACHE_KEY_TTL)
+        if entry_ttl is not None and entry_ttl < ttl:
+            ttl = entry_ttl
+        return now - entry.get(CACHE_KEY_TIMESTAMP, 0) > ttl
+
+    def set(self, key: str, value: List[Dict[str, Any]], ttl: Optional[int] = None) -> None:
+        """Set cache entry with timestamp. ttl caps the reader's TTL for this entry."""
         if self.enabled:
-            self.cache[key] = {
+            entry = {
                 CACHE_KEY_TIMESTAMP: int(time.time()),
                 CACHE_KEY_DATA: value
             }
+            if ttl is not None:
+                entry[CACHE_KEY_TTL] = ttl
+            self.cache[key] = entry
+            self._dirty = True
 
     def add_history(self, command: str, limit: int = 20) -> None:
         """Add command to history with limit enforcement."""
         if not self.enabled:
             return
 
-        if CACHE_KEY_HISTORY not in self.cache:
-            self.cache[CACHE_KEY_HISTORY] = []
-            
-        history = self.cache[CACHE_KEY_HISTORY]
+        history = self.cache.setdefault(CACHE_KEY_HISTORY, [])
         
-        # Rule 1.2.20: Append and shift
+        # Rule 1.2.20: Append and shift (drop the oldest entries in place)
         history.append(command)
         
-        if len(history) > limit:
-            history[:] = history[-limit:]
+        overflow = len(history) - limit
+        if overflow > 0:
+            del history[:overflow]
             
-        self.cache[CACHE_KEY_HISTORY] = history
+        self._dirty = True
         
     def get_history(self) -> List[str]:
         """Get command history."""
@@ -99,13 +153,13 @@ class CacheManager:
         if not self.enabled:
             return 0
         
-        keys_to_remove = [k for k in self.cache.keys() if not k.startswith('_')]
-        count = len(keys_to_remove)
+        kept = {k: v for k, v in self.cache.items() if k[:1] == '_'}
+        count = len(self.cache) - len(kept)
         
-        for key in keys_to_remove:
-            del self.cache[key]
-        
-        self.save()
+        if count:
+            self.cache = kept
+            self._dirty = True
+            self.save()
         return count
     
     def clear_history(self) -> bool:
@@ -118,6 +172,7 @@ class CacheManager:
         
         if CACHE_KEY_HISTORY in self.cache:
             del self.cache[CACHE_KEY_HISTORY]
+            self._dirty = True
             self.save()
             return True
         return False
@@ -127,11 +182,13 @@ class CacheManager:
         Rule 1.2.24: Delete the entire cache file.
         Returns True if file was deleted.
         """
-        if os.path.exists(self.cache_file):
+        try:
             os.remove(self.cache_file)
-            self.cache = {}
-            return True
-        return False
+        except FileNotFoundError:
+            return False
+        self.cache = {}
+        self._dirty = True
+        return True
     
     def purge_expired(self, ttl_map: Dict[str, int] = None) -> int:
         """
@@ -143,28 +200,24 @@ class CacheManager:
             return 0
         
         current_time = int(time.time())
-        keys_to_remove = []
-        
-        for key, entry in self.cache.items():
-            if key.startswith('_'):
-                continue  # Skip internal entries like _history
-            
-            if not isinstance(entry, dict):
-                continue
-            
-            timestamp = entry.get(CACHE_KEY_TIMESTAMP, 0)
-            ttl = ttl_map.get(key, 300)  # Default 5 min TTL
-            
-            if current_time - timestamp > ttl:
-                keys_to_remove.append(key)
+        expired = self._expired
         
-        for key in keys_to_remove:
-            del self.cache[key]
+        # Single pass; internal entries like _history are always kept.
+        # Default 5 min TTL for keys missing from ttl_map
+        kept = {
+            key: entry for key, entry in self.cache.items()
+            if key[:1] == '_'
+            or not isinstance(entry, dict)
+            or not expired(entry, ttl_map.get(key, 300), current_time)
+        }
+        purged = len(self.cache) - len(kept)
         
-        if keys_to_remove:
+        if purged:
+            self.cache = kept
+            self._dirty = True
             self.save()
         
-        return len(keys_to_remove)
+        return purged
     
     # =========================================================================
     # Locals Management (Rules 1.2.25, 1.2.26, 1.2.27)
@@ -178,10 +231,12 @@ class CacheManager:
         if not self.enabled:
             return
         
-        if CACHE_KEY_LOCALS not in self.cache:
-            self.cache[CACHE_KEY_LOCALS] = {}
+        locals_dict = self.cache.setdefault(CACHE_KEY_LOCALS, {})
         
-        self.cache[CACHE_KEY_LOCALS][key] = value
+        # Re-setting the same value (e.g. re-running a set_locals command) is not a change
+        if locals_dict.get(key) != value:
+            locals_dict[key] = value
+            self._dirty = True
         self.save()
     
     def get_local(self, key: str) -> Optional[str]:
@@ -192,8 +247,8 @@ class CacheManager:
         if not self.enabled:
             return None
         
-        locals_dict = self.cache.get(CACHE_KEY_LOCALS, {})
-        return locals_dict.get(key)
+        locals_dict = self.cache.get(CACHE_KEY_LOCALS)
+        return locals_dict.get(key) if locals_dict else None
     
     def get_locals(self) -> Dict[str, str]:
         """Rule 1.2.25: Get all local variables."""
@@ -211,6 +266,7 @@ class CacheManager:
         
         if CACHE_KEY_LOCALS in self.cache:
             del self.cache[CACHE_KEY_LOCALS]
+            self._dirty = True
             self.save()
             return True
         return False
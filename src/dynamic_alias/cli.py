@@ -1,31 +1,42 @@
 import sys
 import os
+import stat
 import shutil
 import hashlib
 from typing import List, Optional
 
-from .config import ConfigLoader
 from .cache import CacheManager
-from .resolver import DataResolver
-from .executor import CommandExecutor
-from .shell import InteractiveShell
-from .validator import ConfigValidator, print_validation_report, validate_config_silent
 from .constants import CUSTOM_SHORTCUT, CUSTOM_NAME
 from .utils import resolve_path
 
 class DynamicAliasCLI:
     """Encapsulates the CLI logic for Dynamic Alias."""
     
-    def __init__(self):
-        self.config_flag = f"--{CUSTOM_SHORTCUT}-config"
-        self.cache_flag = f"--{CUSTOM_SHORTCUT}-cache"
-        self.validate_flag = f"--{CUSTOM_SHORTCUT}-validate"
-        self.clear_cache_flag = f"--{CUSTOM_SHORTCUT}-clear-cache"
-        self.clear_history_flag = f"--{CUSTOM_SHORTCUT}-clear-history"
-        self.clear_all_flag = f"--{CUSTOM_SHORTCUT}-clear-all"
-        self.set_locals_flag = f"--{CUSTOM_SHORTCUT}-set-locals"
-        self.clear_locals_flag = f"--{CUSTOM_SHORTCUT}-clear-locals"
-        self.dya_help_flag = f"--{CUSTOM_SHORTCUT}-help"
+    # Reserved flags depend only on CUSTOM_SHORTCUT, so they are built once at import
+    config_flag = f"--{CUSTOM_SHORTCUT}-config"
+    cache_flag = f"--{CUSTOM_SHORTCUT}-cache"
+    validate_flag = f"--{CUSTOM_SHORTCUT}-validate"
+    clear_cache_flag = f"--{CUSTOM_SHORTCUT}-clear-cache"
+    clear_history_flag = f"--{CUSTOM_SHORTCUT}-clear-history"
+    clear_all_flag = f"--{CUSTOM_SHORTCUT}-clear-all"
+    set_locals_flag = f"--{CUSTOM_SHORTCUT}-set-locals"
+    clear_locals_flag = f"--{CUSTOM_SHORTCUT}-clear-locals"
+    dya_help_flag = f"--{CUSTOM_SHORTCUT}-help"
+
+    # Flag tables for _parse_args: one dict lookup per argv token
+    _switch_flags = {
+        validate_flag: 'run_validation',
+        clear_cache_flag: 'clear_cache',
+        clear_history_flag: 'clear_history',
+        clear_all_flag: 'clear_all',
+        clear_locals_flag: 'clear_locals',
+    }
+    # flag -> (ParsedArgs fields filled from the following argv values, usage)
+    _value_flags = {
+        config_flag: (('config_override',), "requires an argument"),
+        cache_flag: (('cache_override',), "requires an argument"),
+        set_locals_flag: (('set_locals_key', 'set_locals_value'), "requires <key> <value>"),
+    }
 
     def run(self):
         """Main entry point."""
@@ -46,22 +57,32 @@ class DynamicAliasCLI:
 
         # Handle validation
         if parsed.run_validation:
+            from .validator import ConfigValidator, print_validation_report
             validator = ConfigValidator(final_config_path)
             report = validator.validate()
             exit_code = print_validation_report(report, CUSTOM_SHORTCUT)
             sys.exit(exit_code)
             
         # Handle Cache/Locals Management
-        if self._handle_management_flags(parsed, final_cache_path):
+        # One cache manager for whichever path runs below; each loads it on its own
+        cache = CacheManager(final_cache_path, True) # CACHE_ENABLED is typically True
+        if self._handle_management_flags(parsed, cache):
             return
 
         # Ensure Config (SHA Check)
         self._ensure_default_config()
 
         # Load App
-        self._execute_app(parsed.filtered_args, final_config_path, final_cache_path)
+        self._execute_app(parsed.filtered_args, final_config_path, cache)
+
+    def _execute_app(self, filtered_args: List[str], config_path: str, cache: CacheManager):
+        # Imported here rather than at module level: yaml and prompt_toolkit are the
+        # bulk of startup time and --dya-help, --dya-validate and the cache flags skip them
+        from .config import ConfigLoader
+        from .validator import validate_config_silent
+        from .resolver import DataResolver
+        from .executor import CommandExecutor
 
-    def _execute_app(self, filtered_args: List[str], config_path: str, cache_path: str):
         loader = ConfigLoader(config_path)
         try:
             loader.load()
@@ -85,9 +106,11 @@ class DynamicAliasCLI:
         if not validate_config_silent(config_path, CUSTOM_SHORTCUT):
             sys.exit(1)
         
-        cache = CacheManager(cache_path, True) # CACHE_ENABLED is typically True
+        cache_path = cache.cache_file
         cache_existed = os.path.exists(cache_path)
         cache.load()
+        # Rule 1.2.22: Purge memoized dynamic dict results whose cache-ttl expired
+        cache.purge_expired({name: dd.cache_ttl for name, dd in loader.dynamic_dicts.items()})
         
         if verbose:
             if cache_existed:
@@ -120,6 +143,7 @@ class DynamicAliasCLI:
                 print("Error: Command not found.")
         else:
             # Interactive mode
+            from .shell import InteractiveShell
             shell = InteractiveShell(resolver, executor)
             shell.run()
 
@@ -142,46 +166,26 @@ class DynamicAliasCLI:
         i = 0
         while i < len(args):
             arg = args[i]
-            if arg == self.config_flag:
-                if i + 1 < len(args):
-                    parsed.config_override = args[i+1]
-                    i += 2
-                else:
-                    print(f"Error: {self.config_flag} requires an argument")
-                    sys.exit(1)
-            elif arg == self.cache_flag:
-                if i + 1 < len(args):
-                    parsed.cache_override = args[i+1]
-                    i += 2
-                else:
-                    print(f"Error: {self.cache_flag} requires an argument")
-                    sys.exit(1)
-            elif arg == self.validate_flag:
-                parsed.run_validation = True
-                i += 1
-            elif arg == self.clear_cache_flag:
-                parsed.clear_cache = True
-                i += 1
-            elif arg == self.clear_history_flag:
-                parsed.clear_history = True
-                i += 1
-            elif arg == self.clear_all_flag:
-                parsed.clear_all = True
+            switch = self._switch_flags.get(arg)
+            if switch:
+                setattr(parsed, switch, True)
                 i += 1
-            elif arg == self.set_locals_flag:
-                if i + 2 < len(args):
-                    parsed.set_locals_key = args[i+1]
-                    parsed.set_locals_value = args[i+2]
-                    i += 3
-                else:
-                    print(f"Error: {self.set_locals_flag} requires <key> <value>")
-                    sys.exit(1)
-            elif arg == self.clear_locals_flag:
-                parsed.clear_locals = True
-                i += 1
-            else:
+                continue
+            
+            spec = self._value_flags.get(arg)
+            if spec is None:
                 parsed.filtered_args.append(arg)
                 i += 1
+                continue
+            
+            fields, usage = spec
+            values = args[i + 1:i + 1 + len(fields)]
+            if len(values) < len(fields):
+                print(f"Error: {arg} {usage}")
+                sys.exit(1)
+            for field_name, value in zip(fields, values):
+                setattr(parsed, field_name, value)
+            i += 1 + len(fields)
         return parsed
 
     def _resolve_paths(self, parsed: 'ParsedArgs'):
@@ -202,10 +206,10 @@ class DynamicAliasCLI:
             )
         return final_config, final_cache
 
-    def _handle_management_flags(self, parsed: 'ParsedArgs', cache_path: str) -> bool:
+    def _handle_management_flags(self, parsed: 'ParsedArgs', cache: CacheManager) -> bool:
         """Returns True if execution should stop (action performed)."""
         if parsed.clear_cache or parsed.clear_history or parsed.clear_all or parsed.set_locals_key or parsed.clear_locals:
-            cache = CacheManager(cache_path, True)
+            cache_path = cache.cache_file
             try:
                 cache.load()
             except Exception as e:
@@ -249,40 +253,61 @@ class DynamicAliasCLI:
         bundled = os.path.join(os.path.dirname(__file__), f"{CUSTOM_SHORTCUT}.yaml")
         user_home = os.path.expanduser(f"~/.{CUSTOM_SHORTCUT}.yaml")
         
-        if os.path.exists(bundled):
-            should_copy = False
-            reason = ""
-            
-            if not os.path.exists(user_home):
-                should_copy = True
-                reason = "Missing user configuration"
-            else:
-                try:
+        # One stat per file; a missing bundle (e.g. running from source) means nothing to enforce
+        try:
+            bundled_size = os.stat(bundled).st_size
+        except OSError:
+            return
+        
+        should_copy = False
+        reason = ""
+        
+        try:
+            user_size = os.stat(user_home).st_size
+        except OSError:
+            should_copy = True
+            reason = "Missing user configuration"
+        else:
+            try:
+                # Different sizes can never hash equal: skip reading both files
+                if bundled_size != user_size:
+                    should_copy = True
+                else:
                     bundled_hash = self._get_file_hash(bundled)
                     user_hash = self._get_file_hash(user_home)
-                    if bundled_hash != user_hash:
-                        should_copy = True
-                        reason = "Configuration mismatch (SHA variation)"
-                except Exception as e:
-                     print(f"Warning: Failed to verify configuration integrity: {e}")
+                    should_copy = bundled_hash != user_hash
+                if should_copy:
+                    reason = "Configuration mismatch (SHA variation)"
+            except Exception as e:
+                 print(f"Warning: Failed to verify configuration integrity: {e}")
 
-            if should_copy:
-                try:
-                    shutil.copy(bundled, user_home)
-                    print(f"[{CUSTOM_NAME}] Updating default configuration from bundle: {reason}")
-                except Exception as e:
-                    print(f"Warning: Failed to update default configuration: {e}")
+        if should_copy:
+            try:
+                shutil.copy(bundled, user_home)
+                print(f"[{CUSTOM_NAME}] Updating default configuration from bundle: {reason}")
+            except Exception as e:
+                print(f"Warning: Failed to update default configuration: {e}")
 
     def _get_file_hash(self, filepath: str) -> str:
-        hasher = hashlib.sha256()
+        chunk_size = 1 << 16
+        max_bytes = 100000 * 8192
         with open(filepath, 'rb') as f:
-            max_chunks = 100000 
-            chunks_read = 0
-            while chunk := f.read(8192):
-                hasher.update(chunk)
-                chunks_read += 1
-                if chunks_read > max_chunks:
-                    raise RuntimeError(f"Config file too large or infinite read (chunks={chunks_read})")
+            st = os.fstat(f.fileno())
+            # Regular files have a trustworthy size: hash them in C (Python 3.11+)
+            if stat.S_ISREG(st.st_mode) and hasattr(hashlib, 'file_digest'):
+                if st.st_size > max_bytes:
+                    raise RuntimeError(f"Config file too large ({st.st_size} bytes)")
+                return hashlib.file_digest(f, 'sha256').hexdigest()
+            
+            hasher = hashlib.sha256()
+            buf = bytearray(chunk_size)
+            view = memoryview(buf)
+            bytes_read = 0
+            while n := f.readinto(buf):
+                hasher.update(view[:n])
+                bytes_read += n
+                if bytes_read > max_bytes:
+                    raise RuntimeError(f"Config file too large or infinite read (bytes={bytes_read})")
         return hasher.hexdigest()
 
     def _print_app_help(self):
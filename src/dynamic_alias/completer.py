@@ -1,32 +1,40 @@
-import re
-import shlex
+from collections import OrderedDict
 from prompt_toolkit.completion import Completer, Completion
 from .resolver import DataResolver
 from .executor import CommandExecutor
-from .constants import REGEX_APP_VAR
+from .models import ArgConfig
+from .utils import split_command_line
+from .constants import TOKEN_STATIC, TOKEN_APP_VAR, TOKEN_USER_VAR
+
+CONTEXT_CACHE_SIZE = 32
+
+
+def _static_head_mismatch(alias_tokens, token: str) -> bool:
+    """True when the alias starts with static text other than token (cheap pre-check before matching)."""
+    return bool(alias_tokens) and alias_tokens[0][0] == TOKEN_STATIC and alias_tokens[0][1] != token
+
 
 class DynamicAliasCompleter(Completer):
     def __init__(self, resolver: DataResolver, executor: CommandExecutor):
         self.resolver = resolver
         self.executor = executor
+        # Completed tokens -> (matched_cmd_node, scope, used_args_in_scope, part_idx)
+        self._ctx_cache: OrderedDict = OrderedDict()
 
-    def get_completions(self, document, complete_event):
-        text = document.text_before_cursor
-        try:
-            parts = shlex.split(text)
-        except ValueError:
-            # Invalid quotes or other shlex parsing errors
-            return
+    def reset_context_cache(self):
+        """Drop memoized contexts (called when a new input buffer starts)."""
+        self._ctx_cache.clear()
+
+    def _compute_context(self, done: tuple) -> tuple:
+        """
+        Consume fully typed tokens and return the command context they lead to.
+        Results are memoized per token tuple with a small LRU bound.
+        """
+        cached = self._ctx_cache.get(done)
+        if cached is not None:
+            self._ctx_cache.move_to_end(done)
+            return cached
 
-        if not parts:
-            parts = ['']
-        
-        elif text.endswith(' '):
-            parts.append('')
-        
-        # Parse context
-        # We need to traverse the command tree consistent with the input
-        
         scope = self.resolver.config.commands
         used_args_in_scope = set() # Aliases of used args
         
@@ -34,26 +42,25 @@ class DynamicAliasCompleter(Completer):
         part_idx = 0
         
         matched_cmd_node = None # The last command/subcommand matched
-        pending_arg = None # If we are in the middle of an arg (alias match start but not full)
         
-        # We process all parts EXCEPT the last one (which is the one being completed)
+        # We process all completed tokens (the one being typed is not part of done)
         # However, to track context, we try to match as much as possible.
         
-        while part_idx < len(parts) - 1:
-            token = parts[part_idx]
+        while part_idx < len(done):
+            token = done[part_idx]
             match_found = False
             
             # 1. Try Commands/Subs in scope
-            start_parts_slice = parts[part_idx:] 
-            
-            for cmd in scope:
-                cmd_parts = cmd.alias.split()
-                if part_idx + len(cmd_parts) <= len(parts) - 1:
-                     is_match, _, _ = self.executor._match_alias_parts(cmd_parts, parts[part_idx:part_idx+len(cmd_parts)])
+            # Root level: only commands whose head can match this token
+            candidates_in_scope = self.executor._root_candidates(token) if matched_cmd_node is None else scope
+            for cmd in candidates_in_scope:
+                cmd_parts = cmd.alias_tokens
+                if part_idx + len(cmd_parts) <= len(done) and not _static_head_mismatch(cmd_parts, token):
+                     is_match, _, _ = self.executor._match_alias_parts(cmd_parts, done[part_idx:part_idx+len(cmd_parts)])
                      if is_match:
                          matched_cmd_node = cmd
                          part_idx += len(cmd_parts)
-                         scope = cmd.sub if hasattr(cmd, 'sub') else []
+                         scope = cmd.sub
                          used_args_in_scope = set() 
                          match_found = True
                          break
@@ -62,20 +69,17 @@ class DynamicAliasCompleter(Completer):
                 continue
                 
             # 2. Try match ARGS in (matched_cmd_node) context
-            if matched_cmd_node and hasattr(matched_cmd_node, 'args'):
+            if matched_cmd_node:
                 for arg in matched_cmd_node.args:
-                    # Get all alias variants (could be string or list)
-                    alias_variants = arg.alias if isinstance(arg.alias, list) else [arg.alias]
-                    primary_alias = alias_variants[0]
+                    primary_alias = arg.primary_alias
                     
                     if primary_alias in used_args_in_scope:
                         continue
                     
                     # Try matching any variant
-                    for alias_variant in alias_variants:
-                        arg_parts = alias_variant.split()
-                        if part_idx + len(arg_parts) <= len(parts) - 1:
-                            is_match, _, _ = self.executor._match_alias_parts(arg_parts, parts[part_idx:part_idx+len(arg_parts)])
+                    for arg_parts in arg.alias_variants:
+                        if part_idx + len(arg_parts) <= len(done) and not _static_head_mismatch(arg_parts, token):
+                            is_match, _, _ = self.executor._match_alias_parts(arg_parts, done[part_idx:part_idx+len(arg_parts)])
                             if is_match:
                                 used_args_in_scope.add(primary_alias)
                                 part_idx += len(arg_parts)
@@ -88,7 +92,30 @@ class DynamicAliasCompleter(Completer):
                 continue
 
             break
-            
+
+        context = (matched_cmd_node, scope, frozenset(used_args_in_scope), part_idx)
+        self._ctx_cache[done] = context
+        if len(self._ctx_cache) > CONTEXT_CACHE_SIZE:
+            self._ctx_cache.popitem(last=False)
+        return context
+
+    def get_completions(self, document, complete_event):
+        text = document.text_before_cursor
+        try:
+            parts = split_command_line(text)
+        except ValueError:
+            # Invalid quotes or other shlex parsing errors
+            return
+
+        if not parts:
+            parts = ['']
+        
+        elif text.endswith(' '):
+            parts.append('')
+        
+        # Parse context (memoized: fully typed tokens don't change while typing the last one)
+        matched_cmd_node, scope, used_args_in_scope, part_idx = self._compute_context(tuple(parts[:-1]))
+        
         # End of consumption loop.
         # matched_cmd_node is the active command.
         # part_idx points to where we are completions.
@@ -112,16 +139,14 @@ class DynamicAliasCompleter(Completer):
             # Check for Partial Matches starting at part_idx
             
             # 1. Partial Arg?
-            if matched_cmd_node and hasattr(matched_cmd_node, 'args'):
+            if matched_cmd_node:
                 for arg in matched_cmd_node.args:
-                    alias_variants = arg.alias if isinstance(arg.alias, list) else [arg.alias]
-                    primary_alias = alias_variants[0]
+                    primary_alias = arg.primary_alias
                     
                     if primary_alias in used_args_in_scope:
                         continue
                     
-                    for alias_variant in alias_variants:
-                        arg_parts = alias_variant.split()
+                    arg_parts = arg.alias_variants[-1]
                     # Check prefix match
                     # We have `parts[part_idx : -1]` (Completed tokens after match)
                     # And `parts[-1]` (Typing)
@@ -130,14 +155,14 @@ class DynamicAliasCompleter(Completer):
                     consumed_chunk = parts[part_idx:len(parts)-1]
                     
                     # Does this chunk match the start of arg_parts?
-                    if len(consumed_chunk) < len(arg_parts):
+                    if len(consumed_chunk) < len(arg_parts) and not _static_head_mismatch(arg_parts, consumed_chunk[0]):
                         # Potential match
                         is_match, _, _ = self.executor._match_alias_parts(arg_parts[:len(consumed_chunk)], consumed_chunk)
                         if is_match:
                             # We are inside this arg.
                             # What is the expected next token?
                             next_token_idx = len(consumed_chunk)
-                            expected_token_alias = arg_parts[next_token_idx]
+                            _kind, expected_token_alias, _payload = arg_parts[next_token_idx]
                             
                             # Suggestions
                             # If expected token is variable `${...}`, Do NOT yield (Rule 4.18)
@@ -155,8 +180,10 @@ class DynamicAliasCompleter(Completer):
                             return
 
             # 2. Partial Command?
-            for cmd in scope:
-                cmd_parts = cmd.alias.split()
+            # Root level: only commands whose head can match the first unconsumed token
+            candidates_in_scope = self.executor._root_candidates(parts[part_idx]) if matched_cmd_node is None else scope
+            for cmd in candidates_in_scope:
+                cmd_parts = cmd.alias_tokens
                 # Check prefix match
                 # Consumed so far: parts[part_idx:len(parts)-1]
                 consumed_chunk = parts[part_idx:len(parts)-1]
@@ -164,20 +191,19 @@ class DynamicAliasCompleter(Completer):
                 if not consumed_chunk:
                     continue
                     
-                if len(consumed_chunk) < len(cmd_parts):
+                if len(consumed_chunk) < len(cmd_parts) and not _static_head_mismatch(cmd_parts, consumed_chunk[0]):
                     # Check if consumed chunk matches start of alias
                     is_match, _, _ = self.executor._match_alias_parts(cmd_parts[:len(consumed_chunk)], consumed_chunk)
                     if is_match:
                         # We are inside this command alias
                         next_token_idx = len(consumed_chunk)
-                        expected_token_alias = cmd_parts[next_token_idx]
+                        kind, expected_token_alias, payload = cmd_parts[next_token_idx]
                         
                         # Suggestion logic
                         # Dynamic Var $${...}
-                        app_var_match = re.match(REGEX_APP_VAR, expected_token_alias)
-                        if app_var_match:
-                            # Groups: (1) source, (2) optional index, (3) key
-                            source, key = app_var_match.group(1), app_var_match.group(3)
+                        if kind == TOKEN_APP_VAR:
+                            # Payload: (source, optional index, key)
+                            source, _index, key = payload
                             # Lazy load: only resolve this dict when needed
                             data = self.resolver.resolve_one(source)
                             for item in data:
@@ -186,7 +212,7 @@ class DynamicAliasCompleter(Completer):
                                     yield Completion(val + ' ', start_position=-len(prefix))
                         
                         # User Var ${...}
-                        elif expected_token_alias.startswith('${'):
+                        elif kind == TOKEN_USER_VAR:
                              # Rule 4.20: Avoid user defined variables completion like ${sql_text}
                              pass
                              # yield Completion(expected_token_alias, start_position=-len(prefix), display=expected_token_alias)
@@ -217,14 +243,13 @@ class DynamicAliasCompleter(Completer):
             
             if matched_cmd_node:
                 # Subs
-                if hasattr(matched_cmd_node, 'sub'):
+                if matched_cmd_node.sub:
                     candidates.extend(matched_cmd_node.sub)
                 
                 # Args (unused)
-                if hasattr(matched_cmd_node, 'args'):
+                if matched_cmd_node.args:
                     for arg in matched_cmd_node.args:
-                        alias_variants = arg.alias if isinstance(arg.alias, list) else [arg.alias]
-                        primary_alias = alias_variants[0]
+                        primary_alias = arg.primary_alias
                         if primary_alias not in used_args_in_scope:
                             candidates.append(arg)
             else:
@@ -233,22 +258,20 @@ class DynamicAliasCompleter(Completer):
             
             for cand in candidates:
                 # First token of alias (use primary alias for candidates)
-                cand_alias = cand.alias[0] if isinstance(cand.alias, list) else cand.alias
-                cand_parts = cand_alias.split()
-                head = cand_parts[0]
+                cand_parts = cand.alias_variants[0] if isinstance(cand, ArgConfig) else cand.alias_tokens
+                kind, head, payload = cand_parts[0]
                 
                 # Handling dynamic vars $${...}
-                app_var_match = re.match(REGEX_APP_VAR, head)
-                if app_var_match:
-                    # Groups: (1) source, (2) optional index, (3) key
-                    source, key = app_var_match.group(1), app_var_match.group(3)
+                if kind == TOKEN_APP_VAR:
+                    # Payload: (source, optional index, key)
+                    source, _index, key = payload
                     # Lazy load: only resolve this dict when needed
                     data = self.resolver.resolve_one(source)
                     for item in data:
                         val = str(item.get(key, ''))
                         if val.startswith(prefix):
                             yield Completion(val + ' ', start_position=-len(prefix))
-                elif head.startswith('${'):
+                elif kind == TOKEN_USER_VAR:
                      # User var placeholder as start of command? Rare but possible.
                      yield Completion(head + ' ', start_position=-len(prefix))
                 else:
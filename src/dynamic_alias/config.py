@@ -1,10 +1,26 @@
 import os
 import sys
+import copy
 import yaml
 import re
 from typing import Dict, List, Any, Optional, Callable
 from abc import ABC, abstractmethod
 from .models import DictConfig, DynamicDictConfig, CommandConfig, SubCommand, ArgConfig, GlobalConfig
+from .utils import split_yaml_documents
+
+# Prefer libyaml's C loader; fall back to the pure-Python loader when PyYAML was built without it
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader
+
+ENV_VAR_MARKER = '$${env.'
+ENV_VAR_PATTERN = re.compile(r'\$\$\{env\.(\w+)\}')
+
+
+def _env_var_value(match: 're.Match') -> str:
+    """ENV_VAR_PATTERN replacement: the variable's value, empty when unset."""
+    return os.environ.get(match.group(1), '')
 
 
 # =============================================================================
@@ -111,60 +127,74 @@ class ConfigLoader:
 
     def _substitute_env_vars(self, text: str) -> str:
         """Substitute environment variables in text."""
-        if not isinstance(text, str):
+        # Substring check first: most values have no env marker at all
+        if not isinstance(text, str) or ENV_VAR_MARKER not in text:
             return text
-        pattern = r'\$\$\{env\.(\w+)\}'
-        def replace(match):
-            var_name = match.group(1)
-            return os.environ.get(var_name, '')
-        return re.sub(pattern, replace, text)
+        return ENV_VAR_PATTERN.sub(_env_var_value, text)
 
     def _process_data_structure(self, data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Process data structure with environment variable substitution."""
-        processed = []
+        # Items come straight from this load's YAML parse, so they are rewritten in place
+        substitute = self._substitute_env_vars
         for item in data:
-            new_item = {}
             for k, v in item.items():
-                if isinstance(v, str):
-                    new_item[k] = self._substitute_env_vars(v)
-                else:
-                    new_item[k] = v
-            processed.append(new_item)
-        return processed
+                item[k] = substitute(v)
+        return data
 
     def load(self) -> None:
         """Load and parse configuration file using Factory pattern."""
         if not os.path.exists(self.config_file):
             raise FileNotFoundError(f"Config file not found at {self.config_file}")
 
+        # Loader state before this file, restored if the stream has to be re-parsed
+        snapshot = (dict(self.dicts), dict(self.dynamic_dicts), list(self.commands), copy.copy(self.global_config))
+
         # Use utf-8-sig to handle BOM if present (e.g. VS Code on Windows)
         with open(self.config_file, 'r', encoding='utf-8-sig') as f:
-            content = f.read()
-            docs = [doc for doc in content.split('---') if doc.strip()]
-
-        for doc_str in docs:
             try:
-                doc = yaml.safe_load(doc_str)
-                if not doc:
-                    continue
-                
-                if not isinstance(doc, dict):
-                    # Skip documents that aren't dictionaries
-                    continue
-                
-                # Use Factory pattern for block parsing
-                if 'config' in doc:
-                    CONFIG_PARSER.parse(doc, self)
-                else:
-                    doc_type = doc.get('type')
-                    if doc_type in BLOCK_PARSERS:
-                        BLOCK_PARSERS[doc_type].parse(doc, self)
-                    # Unknown types are silently ignored
-
+                # Documents are parsed straight from the file and dispatched as they complete
+                for doc in yaml.load_all(f, Loader=SafeLoader):
+                    self._parse_block(doc)
+            except yaml.YAMLError:
+                # A malformed block aborts load_all; start over block by block
+                # so the remaining valid blocks still load
+                self.dicts, self.dynamic_dicts, self.commands, self.global_config = snapshot
+                f.seek(0)
+                for doc in self._load_blocks_individually(f.read()):
+                    self._parse_block(doc)
+
+        # Keep dynamic dicts in priority order; configs usually declare them in order already
+        priorities = [dd.priority for dd in self.dynamic_dicts.values()]
+        if any(a > b for a, b in zip(priorities, priorities[1:])):
+            self.dynamic_dicts = dict(sorted(self.dynamic_dicts.items(), key=lambda x: x[1].priority))
+
+    def _parse_block(self, doc: Any) -> None:
+        """Dispatch one YAML document to its block parser."""
+        if not doc:
+            return
+        
+        if not isinstance(doc, dict):
+            # Skip documents that aren't dictionaries
+            return
+        
+        # Use Factory pattern for block parsing
+        if 'config' in doc:
+            CONFIG_PARSER.parse(doc, self)
+        else:
+            parser = BLOCK_PARSERS.get(doc.get('type'))
+            if parser is not None:
+                parser.parse(doc, self)
+            # Unknown types are silently ignored
+
+    def _load_blocks_individually(self, content: str) -> List[Any]:
+        """Parse each '---' separated block on its own, reporting and skipping invalid ones."""
+        docs = []
+        for doc_str in split_yaml_documents(content):
+            try:
+                docs.append(yaml.load(doc_str, Loader=SafeLoader))
             except yaml.YAMLError as e:
                 print(f"Error parsing YAML: {e}")
-
-        self.dynamic_dicts = dict(sorted(self.dynamic_dicts.items(), key=lambda x: x[1].priority))
+        return docs
 
     def _parse_command(self, doc: Dict) -> CommandConfig:
         subs = []
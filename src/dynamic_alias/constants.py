@@ -5,28 +5,42 @@ import sys
 DEFAULT_SHORTCUT = "dya"
 DEFAULT_NAME = "DYNAMIC ALIAS"
 
+def _toml_string_value(raw: str):
+    """Value of a one-line TOML string (quoted or bare), ignoring a trailing comment."""
+    raw = raw.strip()
+    if raw[:1] in ('"', "'"):
+        end = raw.find(raw[0], 1)
+        return raw[1:end] if end > 0 else None
+    return raw.split('#', 1)[0].strip() or None
+
 def get_config_from_toml():
     """Try to read from pyproject.toml"""
     try:
         # Assuming src/dynamic_alias/constants.py, go up 3 levels
         base_dir = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
-        toml_path = os.path.join(base_dir, "pyproject.toml")
+        # Fallback: check current directory (common in dev/test)
+        candidates = (os.path.join(base_dir, "pyproject.toml"), os.path.abspath("pyproject.toml"))
         
-        if not os.path.exists(toml_path):
-            # Fallback: check current directory (common in dev/test)
-            cwd_toml = os.path.abspath("pyproject.toml")
-            if os.path.exists(cwd_toml):
-                toml_path = cwd_toml
+        content = None
+        for toml_path in candidates:
+            # EAFP: one open() per candidate instead of exists() probes before it
+            try:
+                with open(toml_path, "r", encoding="utf-8") as f:
+                    content = f.read()
+                break
+            except OSError:
+                continue
         
-        if os.path.exists(toml_path):
-            with open(toml_path, "r", encoding="utf-8") as f:
-                content = f.read()
-            
-            import re
-            
+        if content is not None:
             shortcut = DEFAULT_SHORTCUT
             name = DEFAULT_NAME
             
+            # Cheap substring check before any regex work; most runs have no section
+            if '[custom-build]' not in content:
+                return shortcut, name
+            
+            import re
+            
             custom_section = re.search(r'^\[custom-build\]', content, re.MULTILINE)
             if custom_section:
                 start = custom_section.end()
@@ -35,17 +49,17 @@ def get_config_from_toml():
                 section_text = content[start:end]
                 
                 for line in section_text.splitlines():
-                    line = line.strip()
-                    if line.startswith('shortcut'):
-                        parts = line.split('=')
-                        if len(parts) == 2:
-                            val = parts[1].strip().strip('"\'')
-                            shortcut = val
-                    elif line.startswith('name'):
-                        parts = line.split('=')
-                        if len(parts) == 2:
-                            val = parts[1].strip().strip('"\'')
-                            name = val
+                    key, sep, raw = line.partition('=')
+                    key = key.strip()
+                    if not sep or key not in ('shortcut', 'name'):
+                        continue
+                    val = _toml_string_value(raw)
+                    if val is None:
+                        continue
+                    if key == 'shortcut':
+                        shortcut = val
+                    else:
+                        name = val
                             
             return shortcut, name
             
@@ -61,6 +75,11 @@ CUSTOM_SHORTCUT, CUSTOM_NAME = get_config_from_toml()
 REGEX_APP_VAR = r'\$\$\{(\w+)(?:\[(\d+)\])?\.(\w+)\}'
 REGEX_USER_VAR = r'\$\{(\w+)\}'          # Matches ${var}
 
+# Alias token kinds (see VariableResolver.tokenize_alias)
+TOKEN_STATIC = 'static'
+TOKEN_USER_VAR = 'user_var'
+TOKEN_APP_VAR = 'app_var'
+
 # Configuration CONSTANTS (Moved from validator.py)
 REQUIRED_FIELDS = {
     'dict': ['type', 'name', 'data'],
@@ -86,3 +105,8 @@ CACHE_KEY_HISTORY = '_history'
 CACHE_KEY_LOCALS = '_locals'
 CACHE_KEY_TIMESTAMP = 'timestamp'
 CACHE_KEY_DATA = 'data'
+CACHE_KEY_TTL = 'ttl'  # Optional per-entry TTL override (negative cache)
+
+# Failed dynamic dict runs are cached empty for this long, so a broken source
+# isn't re-run on every invocation but recovers sooner than cache-ttl
+NEGATIVE_CACHE_TTL = 30
@@ -9,10 +9,10 @@ import os
 from typing import Dict, List, Any, Optional, Union
 from prompt_toolkit.shortcuts import print_formatted_text
 from prompt_toolkit.formatted_text import HTML
-from .models import CommandConfig, SubCommand, ArgConfig
+from .models import CommandConfig, SubCommand, ArgConfig, AliasTokens
 from .resolver import DataResolver
 from .utils import VariableResolver
-from .constants import CUSTOM_NAME, CUSTOM_SHORTCUT
+from .constants import CUSTOM_NAME, CUSTOM_SHORTCUT, TOKEN_STATIC, TOKEN_APP_VAR, TOKEN_USER_VAR
 
 
 def _save_terminal_state():
@@ -40,8 +40,54 @@ def _restore_terminal_state(old_state):
 class CommandExecutor:
     def __init__(self, data_resolver: DataResolver):
         self.resolver = data_resolver
+        # Root dispatch table (static buckets, wildcard), built on first lookup
+        self._root_index: Optional[tuple] = None
+        # Same dispatch tables for each sub-command list: id(list) -> (list, buckets, wildcard).
+        # The list is kept alive so its id can't be handed to another list
+        self._sub_indexes: Dict[int, tuple] = {}
 
-    def _match_alias_parts(self, alias_parts: List[str], input_parts: List[str]) -> tuple[bool, Dict[str, Any], bool]:
+    def invalidate_index(self) -> None:
+        """Drop the dispatch tables; call after replacing or editing config.commands."""
+        self._root_index = None
+        self._sub_indexes.clear()
+
+    @staticmethod
+    def _index_by_head(items: list) -> tuple:
+        """
+        Index commands by their first static alias token.
+        Commands starting with a variable can match any head, so they are kept
+        in every bucket to preserve config order (first match wins).
+        """
+        static_index: Dict[str, list] = {}
+        wildcard: list = []
+        for item in items:
+            tokens = item.alias_tokens
+            if tokens and tokens[0][0] == TOKEN_STATIC:
+                head = tokens[0][1]
+                if head not in static_index:
+                    static_index[head] = list(wildcard)
+                static_index[head].append(item)
+            else:
+                wildcard.append(item)
+                for bucket in static_index.values():
+                    bucket.append(item)
+        return static_index, wildcard
+
+    def _root_candidates(self, head: str) -> List[CommandConfig]:
+        """Root commands that can match an input starting with head, in config order."""
+        entry = self._root_index
+        if entry is None:
+            self._root_index = entry = self._index_by_head(self.resolver.config.commands)
+        return entry[0].get(head, entry[1])
+
+    def _sub_candidates(self, subs: List[SubCommand], head: str) -> List[SubCommand]:
+        """Sub-commands of one level that can match head, in config order."""
+        entry = self._sub_indexes.get(id(subs))
+        if entry is None or entry[0] is not subs:
+            self._sub_indexes[id(subs)] = entry = (subs,) + self._index_by_head(subs)
+        return entry[1].get(head, entry[2])
+
+    def _match_alias_parts(self, alias_tokens: AliasTokens, input_parts: List[str]) -> tuple[bool, Dict[str, Any], bool]:
         # Rule 1.3.5: Allow partial match if help is requested. 
         # We don't strictly enforce length check here if we find a help flag.
         
@@ -49,27 +95,18 @@ class CommandExecutor:
         
         # Iterate over available input parts. If input is shorter, matched will be decided by length check at end,
         # unless we find a help flag which shortcuts the process.
-        for i, (alias_token, user_token) in enumerate(zip(alias_parts, input_parts)):
+        # Alias tokens are pre-classified at config load, so no regex runs here.
+        for (kind, alias_token, payload), user_token in zip(alias_tokens, input_parts):
             # 1. Check for app variable: $${source.key} or $${source[N].key}
-            app_var = VariableResolver.parse_app_var(alias_token)
-            if app_var:
+            if kind == TOKEN_APP_VAR:
                 # Note: index is ignored for list mode (alias matching uses all items)
-                source_name, _index, key_name = app_var
+                source_name, _index, key_name = payload
 
                 # Rule 1.3.5: Partial match help for dynamic variables too
                 if user_token in ('-h', '--help'):
                     return True, variables, True
 
-                data_list = self.resolver.resolve_one(source_name)
-                if not data_list:
-                    return False, {}, False
-                
-                found_item = None
-                for item in data_list:
-                    if str(item.get(key_name)) == user_token:
-                        found_item = item
-                        break
-                
+                found_item = self.resolver.find_item(source_name, key_name, user_token)
                 if found_item:
                     variables[source_name] = found_item
                 else:
@@ -78,15 +115,14 @@ class CommandExecutor:
 
 
             # 2. Check for user variable: ${var}
-            var_name = VariableResolver.parse_user_var(alias_token)
-            if var_name:
+            if kind == TOKEN_USER_VAR:
                 # Rule 1.3.2: Can't use -h or --help as command args
                 # But Rule 1.3.5 says partial match should show help.
                 # So if we see help here, we treat it as "Partial Match Help Found" and stop.
                 if user_token in ('-h', '--help'):
                     return True, variables, True
                     
-                variables[var_name] = user_token
+                variables[payload] = user_token
                 continue
 
             # 3. Static match
@@ -95,23 +131,22 @@ class CommandExecutor:
                 return False, {}, False
         
         # End of loop.
-        if len(input_parts) < len(alias_parts):
+        if len(input_parts) < len(alias_tokens):
             return False, {}, False
             
         return True, variables, False
 
     def find_command(self, args: List[str]) -> Optional[tuple[List[Union[CommandConfig, SubCommand, ArgConfig]], Dict[str, Any], bool, List[str]]]:
-        for cmd in self.resolver.config.commands:
+        for cmd in self._root_candidates(args[0] if args else ''):
             chain, variables, is_help, remaining = self._try_match(cmd, args)
             if chain:
                 return chain, variables, is_help, remaining
         return None
 
     def _try_match(self, command_obj: Union[CommandConfig, SubCommand], args: List[str]) -> tuple[List[Union[CommandConfig, SubCommand, ArgConfig]], Dict, bool, List[str]]:
-        alias_parts = command_obj.alias.split()
-        
         # 1. Match Command Alias
-        matched, variables, is_help = self._match_alias_parts(alias_parts, args[:len(alias_parts)])
+        alias_tokens = command_obj.alias_tokens
+        matched, variables, is_help = self._match_alias_parts(alias_tokens, args[:len(alias_tokens)])
         
         if is_help:
             return [command_obj], variables, True, []
@@ -119,45 +154,58 @@ class CommandExecutor:
         if not matched:
             return [], {}, False, []
         
-        remaining_args = args[len(alias_parts):]
+        remaining_args = args[len(alias_tokens):]
         current_chain = [command_obj]
 
-        # 2. Match Command Args (Greedy)
-        while remaining_args and hasattr(command_obj, 'args') and command_obj.args:
-            found_arg = False
-            for arg_obj in command_obj.args:
-                # Support array aliases - try each variant
-                alias_variants = arg_obj.alias if isinstance(arg_obj.alias, list) else [arg_obj.alias]
-                
-                for alias_variant in alias_variants:
-                    arg_alias_parts = alias_variant.split()
-                    matched_arg, arg_vars, arg_is_help = self._match_alias_parts(arg_alias_parts, remaining_args[:len(arg_alias_parts)])
-                    
-                    if arg_is_help:
-                        variables.update(arg_vars)
-                        current_chain.append(arg_obj)
-                        return current_chain, variables, True, []
+        # Walk down the sub-command tree iteratively: the first sub whose alias
+        # matches is taken (no backtracking), so a single chain/variables suffices
+        while True:
+            # 2. Match Command Args (Greedy)
+            while remaining_args and command_obj.args:
+                found_arg = False
+                for arg_obj in command_obj.args:
+                    # Support array aliases - try each variant
+                    for arg_alias_tokens in arg_obj.alias_variants:
+                        matched_arg, arg_vars, arg_is_help = self._match_alias_parts(arg_alias_tokens, remaining_args[:len(arg_alias_tokens)])
+                        
+                        if arg_is_help:
+                            variables.update(arg_vars)
+                            current_chain.append(arg_obj)
+                            return current_chain, variables, True, []
+                        
+                        if matched_arg:
+                            variables.update(arg_vars)
+                            current_chain.append(arg_obj)
+                            remaining_args = remaining_args[len(arg_alias_tokens):]
+                            found_arg = True
+                            break
                     
-                    if matched_arg:
-                        variables.update(arg_vars)
-                        current_chain.append(arg_obj)
-                        remaining_args = remaining_args[len(arg_alias_parts):]
-                        found_arg = True
+                    if found_arg:
                         break
                 
-                if found_arg:
+                if not found_arg:
                     break
+
+            # 3. Match Sub-commands
+            next_sub = None
+            if command_obj.sub and remaining_args:
+                for sub in self._sub_candidates(command_obj.sub, remaining_args[0]):
+                    sub_tokens = sub.alias_tokens
+                    sub_matched, sub_vars, sub_is_help = self._match_alias_parts(sub_tokens, remaining_args[:len(sub_tokens)])
+                    if sub_is_help:
+                        variables.update(sub_vars)
+                        current_chain.append(sub)
+                        return current_chain, variables, True, []
+                    if sub_matched:
+                        variables.update(sub_vars)
+                        current_chain.append(sub)
+                        remaining_args = remaining_args[len(sub_tokens):]
+                        next_sub = sub
+                        break
             
-            if not found_arg:
+            if next_sub is None:
                 break
-
-        # 3. Match Sub-commands
-        if hasattr(command_obj, 'sub') and command_obj.sub and remaining_args:
-            for sub in command_obj.sub:
-                sub_chain, sub_vars, sub_is_help, sub_remaining = self._try_match(sub, remaining_args)
-                if sub_chain:
-                    variables.update(sub_vars)
-                    return current_chain + sub_chain, variables, sub_is_help, sub_remaining
+            command_obj = next_sub
         
         # Check for help flag in remaining args
         if remaining_args and remaining_args[0] in ('-h', '--help'):
@@ -191,25 +239,20 @@ class CommandExecutor:
              print_formatted_text(HTML(f"<b><red>Error:</red></b> Strict mode enabled. Unknown arguments: {' '.join(remaining_args)}"))
              return
 
-        full_template = " ".join([obj.command for obj in command_chain])
+        full_template = " ".join(obj.command for obj in command_chain)
         
-        # Refactored to use VariableResolver (DRY)
-        
-        # 1. App Vars ($${source.key})
-        cmd_resolved = VariableResolver.resolve_app_vars(
-            full_template, 
+        # App vars ($${source.key}) and user vars (${var}) in one pass
+        cmd_resolved = VariableResolver.resolve_vars(
+            full_template,
             resolver_func=self.resolver.resolve_one,
-            context_vars=variables,
+            variables=variables,
             use_local_cache=lambda k: self.resolver.cache.get_local(k)
         )
         
-        # 2. User Vars (${var})
-        cmd_resolved = VariableResolver.resolve_user_vars(cmd_resolved, variables)
-        
         # Append remaining args if not strict
         if remaining_args:
             # Quote arguments to preserve spaces during shell concatenation
-            quoted_extras = " ".join(shlex.quote(arg) for arg in remaining_args)
+            quoted_extras = shlex.join(remaining_args)
             cmd_resolved += " " + quoted_extras
         
         # Flush verbose logs AFTER variable resolution (so chained resolution logs show with current command)
@@ -224,7 +267,7 @@ class CommandExecutor:
         
         try:
             timeout = 0
-            if command_chain and hasattr(command_chain[0], 'timeout'):
+            if command_chain:
                 timeout = command_chain[0].timeout
             
             # If timeout is 0, pass None to subprocess.run (means no timeout)
@@ -232,7 +275,7 @@ class CommandExecutor:
                 
             # Determine if set_locals is enabled for any command in the chain
             # Usually it applies to the leaf subcommand that is executed
-            should_set_locals = any(getattr(obj, 'set_locals', False) for obj in command_chain)
+            should_set_locals = any(obj.set_locals for obj in command_chain)
 
             if should_set_locals:
                 # Rule 4.21: Capture output, validate as simple JSON object, set locals
@@ -246,17 +289,19 @@ class CommandExecutor:
                 
                 try:
                     # Validate JSON
-                    if not result.stdout.strip():
+                    # json.loads skips surrounding whitespace itself, so no stripped copy is made
+                    if not result.stdout or result.stdout.isspace():
                          raise ValueError("Empty output")
                          
-                    output_data = json.loads(result.stdout.strip())
+                    output_data = json.loads(result.stdout)
                     
                     if not isinstance(output_data, dict):
                          raise ValueError("Output must be a JSON object (dict), not a list or scalar")
                     
-                    # Store in locals
-                    for key, value in output_data.items():
-                        self.resolver.cache.set_local(str(key), str(value))
+                    # Store in locals, written to disk once for the whole object
+                    with self.resolver.cache.batch():
+                        for key, value in output_data.items():
+                            self.resolver.cache.set_local(str(key), str(value))
                     
                     print(json.dumps(output_data, indent=2))
                     
@@ -84,14 +84,14 @@ class AutoHelperFormatter(HelperFormatter):
         lines.append(f"        {usage_string}")
         
         # Args section for the target (4 spaces indent, content 8 spaces)
-        if hasattr(target, 'args') and target.args:
+        if target.args:
             lines.append("")
             lines.append("    Args:")
             for arg in target.args:
                 lines.extend(self._format_arg(arg, indent=8))
         
         # Options/Subcommands section for the target (4 spaces indent)
-        if hasattr(target, 'sub') and target.sub:
+        if target.sub:
             lines.append("")
             lines.append("    Options/Subcommands:")
             for sub in target.sub:
@@ -137,7 +137,7 @@ class AutoHelperFormatter(HelperFormatter):
         parts = []
         
         # Add args first: [arg1 | arg2 | ...]
-        if hasattr(obj, 'args') and obj.args:
+        if obj.args:
             arg_flags = []
             for arg in obj.args:
                 arg_flags.extend(self._get_arg_flags(arg))
@@ -145,7 +145,7 @@ class AutoHelperFormatter(HelperFormatter):
                 parts.append(f"[{' | '.join(arg_flags)}]")
         
         # Add subs: [sub1 [...] | sub2 [...] | ...]
-        if hasattr(obj, 'sub') and obj.sub:
+        if obj.sub:
             sub_parts = []
             for sub in obj.sub:
                 sub_optional = self._build_optional_section(sub)
@@ -160,32 +160,17 @@ class AutoHelperFormatter(HelperFormatter):
     
     def _get_arg_flags(self, arg: ArgConfig) -> List[str]:
         """Get flag-only parts from arg alias (without variables)."""
-        if isinstance(arg.alias, list):
-            # For array aliases, get short flags only
-            flags = []
-            for alias in arg.alias:
-                flag = alias.split()[0] if alias else alias
-                flags.append(flag)
-            return flags
-        else:
-            # Single alias
-            flag = arg.alias.split()[0] if arg.alias else arg.alias
-            return [flag]
+        # First token of each alias variant; array aliases give one flag per variant
+        variants = arg.alias if isinstance(arg.alias, list) else [arg.alias]
+        return [tokens[0][1] if tokens else alias for tokens, alias in zip(arg.alias_variants, variants)]
     
     def _get_alias_display(self, obj: Union[CommandConfig, SubCommand, ArgConfig]) -> str:
         """Get display string for alias (handles array format)."""
         if isinstance(obj, ArgConfig) and isinstance(obj.alias, list):
             # Combine array aliases: e.g., "-o, --output ${filename}"
-            return ", ".join(self._strip_vars_prefix(a) for a in obj.alias)
+            return ", ".join(self._get_arg_flags(obj))
         return obj.alias
     
-    def _strip_vars_prefix(self, alias: str) -> str:
-        """Extract just the flag prefix without variables for display."""
-        parts = alias.split()
-        if parts:
-            return parts[0]
-        return alias
-    
     def _format_arg(self, arg: ArgConfig, indent: int) -> List[str]:
         """Format a single argument with proper spacing."""
         lines = []
@@ -1,5 +1,13 @@
+import sys
 from dataclasses import dataclass, field
-from typing import Dict, List, Any, Optional, Union
+from typing import Dict, List, Any, Optional, Union, Tuple, ClassVar
+from .utils import VariableResolver, split_plain_command
+
+# Pre-classified alias token: (kind, token, payload) - see VariableResolver.tokenize_alias
+AliasTokens = Tuple[Tuple[str, str, Any], ...]
+
+# Matcher nodes are read on every keystroke; slot them where dataclasses support it (3.10+)
+_NODE_OPTIONS: Dict[str, Any] = {'slots': True} if sys.version_info >= (3, 10) else {}
 
 @dataclass
 class DictConfig:
@@ -14,14 +22,33 @@ class DynamicDictConfig:
     priority: int = 1
     timeout: int = 10  # Rule 3.9: Default 10s
     cache_ttl: int = 300  # Rule 1.2.2: Default 300s
+    # argv when the command can run without a shell, None otherwise
+    argv: Optional[List[str]] = field(default=None, init=False, repr=False, compare=False)
 
-@dataclass
+    def __post_init__(self):
+        self.argv = split_plain_command(self.command)
+
+@dataclass(**_NODE_OPTIONS)
 class ArgConfig:
     alias: Union[str, List[str]]  # Can be single string or array of aliases
     command: str
     helper: Optional[str] = None
+    # Same shape as commands so the matcher needs no hasattr checks
+    sub: ClassVar[tuple] = ()
+    args: ClassVar[tuple] = ()
+    timeout: ClassVar[int] = 0
+    set_locals: ClassVar[bool] = False
+    # Tokenized form of every alias variant, built once for the matcher
+    alias_variants: Tuple[AliasTokens, ...] = field(default=(), init=False, repr=False, compare=False)
+    # First alias variant, identifies the arg (e.g. in the completer's used-args set)
+    primary_alias: str = field(default='', init=False, repr=False, compare=False)
 
-@dataclass
+    def __post_init__(self):
+        variants = self.alias if isinstance(self.alias, list) else [self.alias]
+        self.alias_variants = tuple(VariableResolver.tokenize_alias(v) for v in variants)
+        self.primary_alias = variants[0] if variants else ''
+
+@dataclass(**_NODE_OPTIONS)
 class SubCommand:
     alias: str
     command: str
@@ -29,6 +56,11 @@ class SubCommand:
     sub: List['SubCommand'] = field(default_factory=list)
     args: List[ArgConfig] = field(default_factory=list)
     set_locals: bool = False  # Rule 4.21: Capture output as locals
+    timeout: ClassVar[int] = 0  # Timeout is taken from the root command
+    alias_tokens: AliasTokens = field(default=(), init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        self.alias_tokens = VariableResolver.tokenize_alias(self.alias)
 
 def default_styles():
     return {
@@ -47,7 +79,7 @@ class GlobalConfig:
     verbose: bool = False   # Rule 1.1.10: Verbose logging
     shell: bool = False     # Rule: Shell mode - execute unrecognized commands directly
 
-@dataclass
+@dataclass(**_NODE_OPTIONS)
 class CommandConfig:
     name: str
     alias: str
@@ -59,4 +91,8 @@ class CommandConfig:
     timeout: int = 0  # Rule 4.9: Default 0
     strict: bool = False  # Strict mode logic
     set_locals: bool = False  # Rule 4.21: Capture output as locals
+    alias_tokens: AliasTokens = field(default=(), init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        self.alias_tokens = VariableResolver.tokenize_alias(self.alias)
 
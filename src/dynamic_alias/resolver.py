@@ -1,10 +1,11 @@
 import subprocess
 import json
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional, Set, Tuple
 from .models import DynamicDictConfig
 from .config import ConfigLoader
 from .cache import CacheManager
 from .utils import VariableResolver
+from .constants import NEGATIVE_CACHE_TTL
 
 class DataResolver:
     def __init__(self, config: ConfigLoader, cache: CacheManager):
@@ -13,6 +14,10 @@ class DataResolver:
         self.resolved_data: Dict[str, List[Dict[str, Any]]] = {}
         self.verbose_log_buffer: List[str] = []  # Buffer for verbose logs during interactive mode
         self._resolution_stack: set = set()  # Track currently resolving dicts for circular reference detection
+        # Dynamic dicts whose last run failed (timeout, launch error, bad output)
+        self._failed_sources: Set[str] = set()
+        # (source, key) -> (data list the index was built from, {str(value): first item})
+        self._indices: Dict[Tuple[str, str], Tuple[List[Dict[str, Any]], Dict[str, Dict[str, Any]]]] = {}
     
     def add_verbose_log(self, message: str):
         """Add a verbose log message to the buffer (for interactive mode)."""
@@ -31,10 +36,13 @@ class DataResolver:
             self.resolved_data[name] = d.data
         
         for name, dd in self.config.dynamic_dicts.items():
+            # Already resolved as a dependency of an earlier dynamic_dict
+            if name in self.resolved_data:
+                continue
             data = self.cache.get(name, ttl=dd.cache_ttl)
             if data is None:
                 data = self._execute_dynamic_source(dd)
-                self.cache.set(name, data)
+                self.cache.set(name, data, ttl=self._entry_ttl(name))
             self.resolved_data[name] = data
 
     def resolve_one(self, name: str) -> List[Dict[str, Any]]:
@@ -86,7 +94,7 @@ class DataResolver:
                         print(f"  Action: Executed command for dynamic resolution")
                         print(f"  Command: {dd.command[:100]}{'...' if len(dd.command) > 100 else ''}")
                     
-                    self.cache.set(name, data)
+                    self.cache.set(name, data, ttl=self._entry_ttl(name))
                     self.cache.save()
                 else:
                     # Warning log for cached empty results
@@ -108,7 +116,25 @@ class DataResolver:
         print(f"  Available dynamic_dicts: {list(self.config.dynamic_dicts.keys())}")
         return []
 
+    def find_item(self, source: str, key: str, value: str) -> Optional[Dict[str, Any]]:
+        """
+        Return the first item of source whose key (as string) equals value.
+        The lookup index is built on first use and rebuilt when the source data changes.
+        """
+        data_list = self.resolve_one(source)
+        if not data_list:
+            return None
+        entry = self._indices.get((source, key))
+        if entry is None or entry[0] is not data_list:
+            index: Dict[str, Dict[str, Any]] = {}
+            for item in data_list:
+                index.setdefault(str(item.get(key)), item)
+            entry = (data_list, index)
+            self._indices[(source, key)] = entry
+        return entry[1].get(value)
+
     def _execute_dynamic_source(self, dd: DynamicDictConfig) -> List[Dict[str, Any]]:
+        self._failed_sources.discard(dd.name)
         try:
             # Refactored to use VariableResolver (DRY)
             # Replaces substitution logic with centralized utility
@@ -118,10 +144,19 @@ class DataResolver:
                 resolver_func=self.resolve_one
             )
             
-            result = subprocess.run(cmd, shell=True, capture_output=True, text=True, timeout=dd.timeout)
+            result = None
+            if dd.argv is not None:
+                # Plain command (no shell syntax, no variables): exec directly, no /bin/sh fork
+                try:
+                    result = subprocess.run(dd.argv, stdin=subprocess.DEVNULL, capture_output=True, text=True, timeout=dd.timeout)
+                except OSError:
+                    # Not an executable on PATH (shell builtin, function...): let the shell run it
+                    result = None
+            if result is None:
+                result = subprocess.run(cmd, shell=True, stdin=subprocess.DEVNULL, capture_output=True, text=True, timeout=dd.timeout)
             if result.returncode != 0:
                 print(f"Error executing dynamic dict '{dd.name}': {result.stderr}")
-                return []
+                return self._source_failed(dd)
 
             # Validate JSON output
             stdout = result.stdout.strip()
@@ -129,7 +164,7 @@ class DataResolver:
                 print(f"Error in dynamic dict '{dd.name}': Command produced no output")
                 print(f"  Command: {cmd[:100]}{'...' if len(cmd) > 100 else ''}")
                 print(f"  Expected: Valid JSON array or object")
-                return []
+                return self._source_failed(dd)
             
             try:
                 raw_json = json.loads(stdout)
@@ -142,9 +177,8 @@ class DataResolver:
                 if len(stdout) > 200:
                     preview += "..."
                 print(f"  Output: {preview}")
-                return []
+                return self._source_failed(dd)
             
-            mapped_data = []
             target_list = raw_json
             if isinstance(raw_json, dict):
                  pass # Heuristic handling
@@ -152,18 +186,37 @@ class DataResolver:
             if not isinstance(target_list, list):
                 target_list = [target_list]
 
-            for item in target_list:
-                new_item = {}
-                for internal_key, json_key in dd.mapping.items():
-                    if json_key in item:
-                        new_item[internal_key] = item[json_key]
-                if new_item:
-                    mapped_data.append(new_item)
-            return mapped_data
+            return self._map_items(dd, target_list)
 
         except subprocess.TimeoutExpired:
             print(f"Error in dynamic dict '{dd.name}': Command timed out after {dd.timeout}s")
-            return []
-        except Exception as e:
+            return self._source_failed(dd)
+        except OSError as e:
+            print(f"Error in dynamic dict '{dd.name}': Failed to run command: {e}")
+            return self._source_failed(dd)
+        except (ValueError, TypeError, AttributeError) as e:
+            # Output JSON doesn't have the expected shape for the mapping
             print(f"Error in dynamic dict '{dd.name}': {e}")
-            return []
+            return self._source_failed(dd)
+
+    def _source_failed(self, dd: DynamicDictConfig) -> List[Dict[str, Any]]:
+        """Record a failed run so its empty result is cached with NEGATIVE_CACHE_TTL."""
+        self._failed_sources.add(dd.name)
+        return []
+
+    def _entry_ttl(self, name: str) -> Optional[int]:
+        """Per-entry TTL override for cache.set: short for failed runs, None otherwise."""
+        return NEGATIVE_CACHE_TTL if name in self._failed_sources else None
+
+    @staticmethod
+    def _map_items(dd: DynamicDictConfig, items) -> List[Dict[str, Any]]:
+        """Apply dd.mapping to each item, dropping items with no mapped key."""
+        mapped_data = []
+        for item in items:
+            new_item = {}
+            for internal_key, json_key in dd.mapping.items():
+                if json_key in item:
+                    new_item[internal_key] = item[json_key]
+            if new_item:
+                mapped_data.append(new_item)
+        return mapped_data
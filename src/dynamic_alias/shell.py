@@ -9,6 +9,7 @@ from prompt_toolkit.formatted_text import HTML
 from .resolver import DataResolver
 from .executor import CommandExecutor
 from .completer import DynamicAliasCompleter
+from .utils import split_command_line
 from .constants import CUSTOM_SHORTCUT
 
 class CacheHistory(History):
@@ -119,6 +120,7 @@ class InteractiveShell:
             while True:
                 try:
                     text = session.prompt(f'{CUSTOM_SHORTCUT} > ', placeholder=placeholder_html)
+                    completer.reset_context_cache()
                     text = text.strip()
                     if not text:
                         continue
@@ -134,9 +136,8 @@ class InteractiveShell:
                     if text in ['exit', 'quit']:
                         break
                         
-                    import shlex
                     try:
-                        parts = shlex.split(text)
+                        parts = split_command_line(text)
                     except ValueError:
                         print("Error: Invalid quotes")
                         continue
@@ -1,7 +1,18 @@
 import re
 import os
+import sys
+import shlex
 from typing import List, Dict, Any, Callable, Optional, Tuple, Set
-from .constants import REGEX_APP_VAR, REGEX_USER_VAR
+from .constants import (
+    REGEX_APP_VAR, REGEX_USER_VAR,
+    TOKEN_STATIC, TOKEN_USER_VAR, TOKEN_APP_VAR
+)
+
+# Compiled once at import; these run on every alias match and substitution
+APP_VAR_PATTERN = re.compile(REGEX_APP_VAR)
+USER_VAR_PATTERN = re.compile(REGEX_USER_VAR)
+# App var groups 1-3, user var group 4
+ANY_VAR_PATTERN = re.compile(f'{REGEX_APP_VAR}|{REGEX_USER_VAR}')
 
 class VariableResolver:
     """Helper class for variable substitution (DRY compliance)."""
@@ -14,7 +25,7 @@ class VariableResolver:
         """
         if not isinstance(text, str):
             return set()
-        return set(re.findall(REGEX_APP_VAR, text))
+        return set(APP_VAR_PATTERN.findall(text))
 
     @staticmethod
     def resolve_app_vars(text: str, resolver_func: Callable[[str], List[Dict]], 
@@ -32,6 +43,14 @@ class VariableResolver:
             - List Mode (context_vars): Uses matched item, ignores index
             - Direct Mode: Uses specified index or defaults to 0
         """
+        return APP_VAR_PATTERN.sub(
+            VariableResolver._app_var_replacer(resolver_func, context_vars, use_local_cache), text
+        )
+
+    @staticmethod
+    def _app_var_replacer(resolver_func: Callable[[str], List[Dict]], context_vars: Optional[Dict[str, Any]],
+                          use_local_cache: Optional[Callable[[str], Any]]) -> Callable[[Any], str]:
+        """Build the re.sub callback for app vars (groups 1-3 of the match)."""
         if context_vars is None:
             context_vars = {}
 
@@ -71,8 +90,8 @@ class VariableResolver:
                     return match.group(0)
                 
             return match.group(0)
-            
-        return re.sub(REGEX_APP_VAR, replace, text)
+
+        return replace
 
     @staticmethod
     def resolve_user_vars(text: str, variables: Dict[str, str]) -> str:
@@ -83,7 +102,25 @@ class VariableResolver:
                 return variables[key]
             return match.group(0)
         
-        return re.sub(REGEX_USER_VAR, replace, text)
+        return USER_VAR_PATTERN.sub(replace, text)
+
+    @staticmethod
+    def resolve_vars(text: str, resolver_func: Callable[[str], List[Dict]], variables: Dict[str, Any],
+                     use_local_cache: Callable[[str], Any] = None) -> str:
+        """
+        Replace app vars and user vars in a single pass over text.
+        variables is used both as List Mode context and for ${var} values.
+        """
+        replace_app_var = VariableResolver._app_var_replacer(resolver_func, variables, use_local_cache)
+
+        def replace(match):
+            user_key = match.group(4)
+            if user_key is None:
+                return replace_app_var(match)
+            value = variables.get(user_key)
+            return value if isinstance(value, str) else match.group(0)
+
+        return ANY_VAR_PATTERN.sub(replace, text)
 
     @staticmethod
     def parse_app_var(text: str) -> Optional[Tuple[str, Optional[str], str]]:
@@ -91,7 +128,7 @@ class VariableResolver:
         Check if text is $${source.key} or $${source[N].key}.
         Returns: (source, index_or_None, key) or None
         """
-        match = re.fullmatch(REGEX_APP_VAR, text)
+        match = APP_VAR_PATTERN.fullmatch(text)
         if match:
             return match.group(1), match.group(2), match.group(3)
         return None
@@ -99,13 +136,81 @@ class VariableResolver:
     @staticmethod
     def parse_user_var(text: str) -> Optional[str]:
         """Check if text is ${var} and return var_name."""
-        match = re.fullmatch(REGEX_USER_VAR, text)
+        match = USER_VAR_PATTERN.fullmatch(text)
         if match:
             return match.group(1)
         return None
 
+    @staticmethod
+    def tokenize_alias(alias: str) -> Tuple[Tuple[str, str, Any], ...]:
+        """
+        Split an alias into classified tokens (done once at config load).
+        Returns: Tuple of (kind, token, payload) where payload is
+        (source, index_or_None, key) for TOKEN_APP_VAR, the variable name
+        for TOKEN_USER_VAR and None for TOKEN_STATIC.
+        """
+        if not isinstance(alias, str):
+            return ()
+        tokens = []
+        for token in alias.split():
+            app_var = VariableResolver.parse_app_var(token)
+            if app_var:
+                tokens.append((TOKEN_APP_VAR, token, app_var))
+                continue
+            var_name = VariableResolver.parse_user_var(token)
+            if var_name:
+                tokens.append((TOKEN_USER_VAR, token, var_name))
+            else:
+                tokens.append((TOKEN_STATIC, token, None))
+        return tuple(tokens)
+
 
 def resolve_path(options: List[str], default: str) -> str:
     """Resolve path from options, checking existence, fallback to default."""
     return next((p for p in map(os.path.expanduser, options) 
                 if os.path.exists(p)), os.path.expanduser(default))
+
+
+# YAML document marker: '---' opening a line, never a '---' inside a value
+_DOC_SEPARATOR_PATTERN = re.compile(r'^---(?=\s|$)', re.MULTILINE)
+
+
+def split_yaml_documents(content: str) -> List[str]:
+    """Split multi-document YAML text on its '---' marker lines, dropping blank documents."""
+    return [doc for doc in _DOC_SEPARATOR_PATTERN.split(content) if doc.strip()]
+
+
+# Quotes, escapes or whitespace shlex doesn't split on: input needs the full shlex parser
+_SHLEX_NEEDED_PATTERN = re.compile(r'[\'"\\]|[^\S \t\r\n]')
+
+
+def split_command_line(text: str) -> List[str]:
+    """
+    Split input like shlex.split, using str.split when nothing in the text
+    needs shlex quoting rules. Raises ValueError on unbalanced quotes.
+    """
+    if _SHLEX_NEEDED_PATTERN.search(text):
+        return shlex.split(text)
+    return text.split()
+
+
+# Anything the shell would interpret beyond plain quoting: expansions, redirection,
+# pipelines, globbing, comments, escapes and multi-line scripts
+_SHELL_SYNTAX_PATTERN = re.compile(r'[|&;<>()$`\\*?\[\]{}~#!\n]')
+
+
+def split_plain_command(command: str) -> Optional[List[str]]:
+    """
+    Return argv for a command that can be exec'd without /bin/sh, or None
+    when it relies on shell syntax (or on Windows, where cmd.exe parses it).
+    """
+    if sys.platform == 'win32' or not isinstance(command, str) or _SHELL_SYNTAX_PATTERN.search(command):
+        return None
+    try:
+        argv = shlex.split(command)
+    except ValueError:
+        return None
+    # Leading VAR=value assignments are shell syntax too
+    if not argv or '=' in argv[0]:
+        return None
+    return argv
@@ -16,7 +16,8 @@ from typing import Dict, List, Tuple, Any, Set, Optional, Protocol
 from dataclasses import dataclass, field
 from abc import ABC, abstractmethod
 from .constants import REQUIRED_FIELDS, OPTIONAL_FIELDS, CONFIG_KEYS
-from .utils import VariableResolver
+from .utils import VariableResolver, split_yaml_documents
+from .config import SafeLoader
 
 
 @dataclass
@@ -261,6 +262,8 @@ class ConfigValidator:
         self.config_path = config_path
         self.report = ValidationReport(config_path=config_path)
         self.raw_content = ""
+        # Documents from a single load_all pass; None when the stream had to be checked per block
+        self._docs: Optional[List[Any]] = None
         self.blocks: List[Dict[str, Any]] = []
         self.dicts: Dict[str, Dict] = {}
         self.dynamic_dicts: Dict[str, Dict] = {}
@@ -318,20 +321,24 @@ class ConfigValidator:
             with open(self.config_path, 'r', encoding='utf-8-sig') as f:
                 self.raw_content = f.read()
             
-            # Try to parse each document
-            docs = [doc for doc in self.raw_content.split('---') if doc.strip()]
-            
-            for i, doc_str in enumerate(docs, 1):
-                try:
-                    yaml.safe_load(doc_str)
-                except yaml.YAMLError as e:
-                    self.report.add(ValidationResult(
-                        passed=False,
-                        message=f"Invalid YAML syntax in block {i}",
-                        hint=str(e),
-                        location=f"Block {i}"
-                    ))
-                    return False
+            try:
+                # Whole stream in one pass; _parse_blocks reuses the documents
+                self._docs = list(yaml.load_all(self.raw_content, Loader=SafeLoader))
+            except yaml.YAMLError:
+                # Re-parse each document on its own to report which block is broken
+                docs = split_yaml_documents(self.raw_content)
+                
+                for i, doc_str in enumerate(docs, 1):
+                    try:
+                        yaml.load(doc_str, Loader=SafeLoader)
+                    except yaml.YAMLError as e:
+                        self.report.add(ValidationResult(
+                            passed=False,
+                            message=f"Invalid YAML syntax in block {i}",
+                            hint=str(e),
+                            location=f"Block {i}"
+                        ))
+                        return False
             
             self.report.add(ValidationResult(
                 passed=True,
@@ -349,11 +356,16 @@ class ConfigValidator:
     
     def _parse_blocks(self) -> None:
         """Parse config into blocks and categorize them."""
-        docs = [doc for doc in self.raw_content.split('---') if doc.strip()]
-        
-        for i, doc_str in enumerate(docs, 1):
+        # Blocks are numbered by their '---' chunk in the file, comment-only ones
+        # included, so locations match the per-block syntax errors
+        chunks = split_yaml_documents(self.raw_content)
+        docs = self._docs
+        if docs is None or len(docs) != len(chunks) or None in docs:
+            # Empty documents and a comment-only preamble shift load_all's numbering
+            docs = [self._load_block(doc_str) for doc_str in chunks]
+        
+        for i, doc in enumerate(docs, 1):
             try:
-                doc = yaml.safe_load(doc_str)
                 if not doc or not isinstance(doc, dict):
                     continue
                 
@@ -375,6 +387,14 @@ class ConfigValidator:
             except Exception:
                 pass
     
+    @staticmethod
+    def _load_block(doc_str: str) -> Any:
+        """Parse a single block, None when it is not valid YAML."""
+        try:
+            return yaml.load(doc_str, Loader=SafeLoader)
+        except yaml.YAMLError:
+            return None
+    
     def _validate_block_structures(self) -> None:
         """Validate block structures using Strategy pattern."""
         
@@ -36,3 +36,9 @@ class MockCompletion:
         self.start_position = start_position
         self.display = display
 sys.modules['prompt_toolkit.completion'].Completion = MockCompletion
+
+# The CLI imports the interactive shell lazily; bind shell/completer to the mocks
+# above now, before individual test files replace the prompt_toolkit entries
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+import dynamic_alias.shell  # noqa: E402,F401
@@ -44,3 +44,24 @@ def test_bundled_config_message_format():
     
     assert "Updating default configuration from bundle" in message
     assert "Missing user configuration" in message
+
+def test_size_mismatch_copies_without_hashing(tmp_path):
+    """A user config whose size differs from the bundle is replaced without hashing"""
+    from dynamic_alias import cli as cli_module
+
+    bundle_dir = tmp_path / "bundle"
+    bundle_dir.mkdir()
+    (bundle_dir / f"{CUSTOM_SHORTCUT}.yaml").write_text("# bundled default config\n")
+    user_config = tmp_path / f".{CUSTOM_SHORTCUT}.yaml"
+    user_config.write_text("# edited\n")
+
+    cli = cli_module.DynamicAliasCLI()
+    with patch.object(cli_module, '__file__', str(bundle_dir / "cli.py")), \
+         patch('os.path.expanduser', return_value=str(user_config)), \
+         patch.object(cli_module.shutil, 'copy') as mock_copy, \
+         patch.object(cli_module.DynamicAliasCLI, '_get_file_hash') as mock_hash, \
+         patch('builtins.print'):
+        cli._ensure_default_config()
+
+    mock_hash.assert_not_called()
+    mock_copy.assert_called_once()
@@ -9,6 +9,8 @@ Tests for:
 - Rule 1.2.22: Purge expired cache entries on load
 - Rule 1.2.23: --${shortcut}-clear-history (purge _history)
 - Rule 1.2.24: --${shortcut}-clear-all (delete cache file)
+- Save skipped when the cache is unchanged
+- Values stdlib json accepts survive a save/load round trip
 """
 import os
 import sys
@@ -255,6 +257,190 @@ class TestPurgeExpired(unittest.TestCase):
         self.assertNotIn('short_ttl', cache.cache)
         self.assertIn('long_ttl', cache.cache)
 
+    def test_cli_startup_purges_with_config_ttls(self):
+        """Starting the app purges entries past their dynamic_dict cache-ttl."""
+        from dynamic_alias.cli import DynamicAliasCLI
+        from dynamic_alias.constants import CUSTOM_SHORTCUT
+        
+        config_path = os.path.join(os.path.dirname(__file__), "dya.yaml")
+        ten_seconds_ago = int(time.time()) - 10
+        with open(self.cache_path, 'w') as f:
+            json.dump({
+                'cached_items': {'timestamp': ten_seconds_ago, 'data': [{'name': 'item-1'}]},  # cache-ttl: 2
+                'dynamic_nodes': {'timestamp': ten_seconds_ago, 'data': [{'name': 'node-1'}]},  # default 300
+                '_history': ['cmd1'],
+                '_locals': {'env': 'dev'}
+            }, f)
+        
+        argv = ['dya', '-h', f'--{CUSTOM_SHORTCUT}-config', config_path, f'--{CUSTOM_SHORTCUT}-cache', self.cache_path]
+        with patch('sys.argv', argv), \
+             patch.object(DynamicAliasCLI, '_ensure_default_config'), \
+             patch('dynamic_alias.executor.print_formatted_text'), \
+             patch('sys.stdout'):
+            DynamicAliasCLI().run()
+        
+        with open(self.cache_path, 'r') as f:
+            saved = json.load(f)
+        self.assertNotIn('cached_items', saved)
+        self.assertIn('dynamic_nodes', saved)
+        self.assertEqual(saved['_history'], ['cmd1'])
+        self.assertEqual(saved['_locals'], {'env': 'dev'})
+
+
+class TestSaveWhenChanged(unittest.TestCase):
+    """save() only writes when memory differs from disk."""
+    
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.cache_path = os.path.join(self.temp_dir.name, "cache.json")
+        
+    def tearDown(self):
+        self.temp_dir.cleanup()
+    
+    def test_save_skipped_after_load_without_changes(self):
+        """A load followed by save must not rewrite the file."""
+        cache = CacheManager(self.cache_path, enabled=True)
+        cache.set('items', [{'id': 1}])
+        cache.save()
+        
+        # Replace the file behind the manager's back; an unchanged save must not touch it
+        cache.load()
+        with open(self.cache_path, 'w') as f:
+            json.dump({'external': True}, f)
+        cache.save()
+        
+        with open(self.cache_path, 'r') as f:
+            self.assertEqual(json.load(f), {'external': True})
+    
+    def test_mutations_mark_cache_dirty(self):
+        """set, add_history and direct assignment are all persisted."""
+        cache = CacheManager(self.cache_path, enabled=True)
+        cache.cache = {'_history': []}
+        cache.save()
+        cache.add_history('cmd1')
+        cache.save()
+        cache.set('items', [])
+        cache.save()
+        
+        with open(self.cache_path, 'r') as f:
+            saved = json.load(f)
+        self.assertEqual(saved['_history'], ['cmd1'])
+        self.assertIn('items', saved)
+    
+    def test_save_leaves_no_temp_file(self):
+        """The cache is written to a temp file and renamed into place."""
+        cache = CacheManager(self.cache_path, enabled=True)
+        cache.set('items', [{'id': 1}])
+        cache.save()
+        
+        self.assertEqual(os.listdir(self.temp_dir.name), ['cache.json'])
+
+    @unittest.skipIf(sys.platform == 'win32', "Symlinks need extra privileges on Windows")
+    def test_save_writes_through_symlink(self):
+        """A symlinked cache file keeps its link; the target gets the new contents."""
+        real_dir = os.path.join(self.temp_dir.name, "real")
+        os.mkdir(real_dir)
+        real_path = os.path.join(real_dir, "cache.json")
+        with open(real_path, 'w') as f:
+            json.dump({}, f)
+        os.symlink(real_path, self.cache_path)
+
+        cache = CacheManager(self.cache_path, enabled=True)
+        cache.set('items', [{'id': 1}])
+        cache.save()
+
+        self.assertTrue(os.path.islink(self.cache_path))
+        with open(real_path, 'r') as f:
+            self.assertEqual(json.load(f)['items']['data'], [{'id': 1}])
+        self.assertEqual(sorted(os.listdir(real_dir)), ['cache.json'])
+
+    def test_set_local_same_value_skips_save(self):
+        """Setting a local to its current value must not rewrite the file."""
+        cache = CacheManager(self.cache_path, enabled=True)
+        cache.set_local('env', 'dev')
+
+        with open(self.cache_path, 'w') as f:
+            json.dump({'external': True}, f)
+        cache.set_local('env', 'dev')
+
+        with open(self.cache_path, 'r') as f:
+            self.assertEqual(json.load(f), {'external': True})
+
+    @unittest.skipIf(sys.platform == 'win32', "POSIX permissions only")
+    def test_saved_file_is_owner_only(self):
+        """The cache file is created with 0o600 permissions."""
+        cache = CacheManager(self.cache_path, enabled=True)
+        cache.set_local('token', 'secret')
+
+        self.assertEqual(os.stat(self.cache_path).st_mode & 0o777, 0o600)
+
+    def test_batch_defers_set_local_saves(self):
+        """set_local inside batch() writes the file once, on exit."""
+        cache = CacheManager(self.cache_path, enabled=True)
+        with cache.batch():
+            cache.set_local('a', '1')
+            cache.set_local('b', '2')
+            self.assertFalse(os.path.exists(self.cache_path))
+
+        with open(self.cache_path, 'r') as f:
+            self.assertEqual(json.load(f)['_locals'], {'a': '1', 'b': '2'})
+
+
+class TestJsonCompatibility(unittest.TestCase):
+    """The cache accepts everything stdlib json reads and writes."""
+    
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.cache_path = os.path.join(self.temp_dir.name, "cache.json")
+        
+    def tearDown(self):
+        self.temp_dir.cleanup()
+    
+    def test_big_int_round_trip(self):
+        """Ints above 64 bits (valid dynamic dict output) are saved and loaded back exactly."""
+        cache = CacheManager(self.cache_path, enabled=True)
+        cache.set('big', [{'id': 2 ** 70 + 1, 'neg': -2 ** 63 - 1}])
+        cache.add_history('cmd1')
+        cache.save()
+        
+        cache2 = CacheManager(self.cache_path, enabled=True)
+        cache2.load()
+        self.assertEqual(cache2.cache['big']['data'], [{'id': 2 ** 70 + 1, 'neg': -2 ** 63 - 1}])
+        self.assertIsInstance(cache2.cache['big']['data'][0]['id'], int)
+        self.assertEqual(cache2.cache['_history'], ['cmd1'])
+    
+    def test_non_finite_floats_load(self):
+        """Files holding NaN/Infinity (written by json.dump) load instead of being reset."""
+        with open(self.cache_path, 'w') as f:
+            json.dump({'data': {'timestamp': 1, 'data': [{'v': float('inf')}]},
+                       '_history': ['cmd1'], '_locals': {'env': 'dev'}}, f)
+        
+        cache = CacheManager(self.cache_path, enabled=True)
+        cache.load()
+        self.assertEqual(cache.cache['_history'], ['cmd1'])
+        self.assertEqual(cache.get_local('env'), 'dev')
+        self.assertEqual(cache.cache['data']['data'][0]['v'], float('inf'))
+    
+    def test_non_finite_floats_round_trip(self):
+        """Infinity and NaN survive save/load instead of turning into null."""
+        cache = CacheManager(self.cache_path, enabled=True)
+        cache.set('data', [{'v': float('inf'), 'n': float('nan'), 'none': None}])
+        cache.save()
+        
+        cache2 = CacheManager(self.cache_path, enabled=True)
+        cache2.load()
+        item = cache2.cache['data']['data'][0]
+        self.assertEqual(item['v'], float('inf'))
+        self.assertNotEqual(item['n'], item['n'])
+        self.assertIsNone(item['none'])
+        
+        # A loaded Infinity is written back as Infinity on the next save
+        cache2.add_history('cmd1')
+        cache2.save()
+        cache3 = CacheManager(self.cache_path, enabled=True)
+        cache3.load()
+        self.assertEqual(cache3.cache['data']['data'][0]['v'], float('inf'))
+
 
 if __name__ == '__main__':
     unittest.main()
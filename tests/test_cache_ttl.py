@@ -64,5 +64,30 @@ class TestCacheTTL(unittest.TestCase):
                 assert 'timestamp' in cache_content['cached_items']
                 assert 'data' in cache_content['cached_items']
 
+    def test_failed_source_cached_with_negative_ttl(self):
+        # A timed-out dynamic dict is cached empty, but only for NEGATIVE_CACHE_TTL
+        import subprocess
+        from dynamic_alias.constants import NEGATIVE_CACHE_TTL, CACHE_KEY_TTL, CACHE_KEY_TIMESTAMP
+        with patch('dynamic_alias.resolver.subprocess.run', side_effect=subprocess.TimeoutExpired('cmd', 10)):
+            with patch('sys.stdout', new_callable=MagicMock):
+                self.assertEqual(self.resolver.resolve_one('dynamic_nodes'), [])
+        
+        entry = self.cache_manager.cache['dynamic_nodes']
+        self.assertEqual(entry[CACHE_KEY_TTL], NEGATIVE_CACHE_TTL)
+        self.assertEqual(self.cache_manager.get('dynamic_nodes', ttl=300), [])
+        
+        # Past the negative TTL the entry is stale even though cache-ttl is longer
+        entry[CACHE_KEY_TIMESTAMP] -= NEGATIVE_CACHE_TTL + 1
+        self.assertIsNone(self.cache_manager.get('dynamic_nodes', ttl=300))
+
+    def test_successful_source_has_no_ttl_override(self):
+        from dynamic_alias.constants import CACHE_KEY_TTL
+        with patch('dynamic_alias.resolver.subprocess.run') as mock_run:
+            mock_run.return_value.stdout = '[{"id": "node-1"}]'
+            mock_run.return_value.returncode = 0
+            self.resolver.resolve_one('dynamic_nodes')
+        
+        self.assertNotIn(CACHE_KEY_TTL, self.cache_manager.cache['dynamic_nodes'])
+
 if __name__ == '__main__':
     unittest.main()
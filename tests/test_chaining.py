@@ -243,7 +243,27 @@ class TestDynamicDictChaining(unittest.TestCase):
             self.assertEqual(len(call_order), 2)
             self.assertIn('CHAIN', call_order[0])  # level1 has $${base_prefix.prefix} -> CHAIN
             self.assertIn('CHAIN-LEVEL1', call_order[1])  # level2 has resolved level1 value
-    
+
+    def test_resolve_all_runs_each_chained_dict_once(self):
+        """resolve_all should resolve level1 before level2, each exactly once."""
+        with patch('dynamic_alias.resolver.subprocess.run') as mock_run:
+            def subprocess_side_effect(cmd, **kwargs):
+                result = MagicMock()
+                result.returncode = 0
+                if 'CHAIN-LEVEL1' not in str(cmd):
+                    result.stdout = '[{"value": "CHAIN-LEVEL1"}]'
+                else:
+                    result.stdout = '[{"value": "CHAIN-LEVEL1-LEVEL2"}]'
+                return result
+
+            mock_run.side_effect = subprocess_side_effect
+
+            self.resolver.resolve_all()
+
+            chain_cmds = [c[0][0] for c in mock_run.call_args_list if 'CHAIN' in c[0][0]]
+            self.assertEqual(len(chain_cmds), 2)
+            self.assertEqual(self.resolver.resolved_data['level2_chain'][0]['result'], 'CHAIN-LEVEL1-LEVEL2')
+
     # =========================================================================
     # Caching Tests
     # =========================================================================
@@ -18,7 +18,7 @@ def test_dya_help_flag(capsys):
     # Test --dya-help
     argv = ['script_name', f'--{CUSTOM_SHORTCUT}-help']
     
-    with patch.object(cli_module, 'InteractiveShell') as MockShell:
+    with patch('dynamic_alias.shell.InteractiveShell') as MockShell:
         MockShell.return_value.run.return_value = None
         with patch('sys.argv', argv):
             try:
@@ -40,7 +40,7 @@ def test_global_help_footer(capsys):
     config_path = os.path.join(os.path.dirname(__file__), "dya.yaml")
     argv = ['script_name', '-h', f'--{CUSTOM_SHORTCUT}-config', config_path]
     
-    with patch.object(cli_module, 'InteractiveShell') as MockShell:
+    with patch('dynamic_alias.shell.InteractiveShell') as MockShell:
         MockShell.return_value.run.return_value = None
         with patch('sys.argv', argv):
             try:
@@ -60,7 +60,7 @@ def test_missing_config_with_help(capsys):
     non_existent_config = "/path/to/non_existent_config.yaml"
     argv = ['script_name', '-h', f'--{CUSTOM_SHORTCUT}-config', non_existent_config]
     
-    with patch.object(cli_module, 'InteractiveShell') as MockShell:
+    with patch('dynamic_alias.shell.InteractiveShell') as MockShell:
         MockShell.return_value.run.return_value = None
         with patch('sys.argv', argv):
             try:
@@ -80,7 +80,7 @@ def test_missing_config_without_help(capsys):
     non_existent_config = "/path/to/non_existent_config.yaml"
     argv = ['script_name', f'--{CUSTOM_SHORTCUT}-config', non_existent_config]
     
-    with patch.object(cli_module, 'InteractiveShell') as MockShell:
+    with patch('dynamic_alias.shell.InteractiveShell') as MockShell:
         MockShell.return_value.run.return_value = None
         with patch('sys.argv', argv):
             try:
@@ -96,3 +96,19 @@ def test_missing_config_without_help(capsys):
     # App help should NOT be printed without -h flag
     assert "Application Help" not in output
 
+
+def test_parse_args_flags_and_values(capsys):
+    cli = cli_module.DynamicAliasCLI()
+    parsed = cli._parse_args([
+        f'--{CUSTOM_SHORTCUT}-config', 'cfg.yaml', 'run',
+        f'--{CUSTOM_SHORTCUT}-set-locals', 'env', 'dev',
+        f'--{CUSTOM_SHORTCUT}-clear-history', 'now',
+    ])
+    assert parsed.config_override == 'cfg.yaml'
+    assert (parsed.set_locals_key, parsed.set_locals_value) == ('env', 'dev')
+    assert parsed.clear_history is True
+    assert parsed.filtered_args == ['run', 'now']
+
+    with pytest.raises(SystemExit):
+        cli._parse_args([f'--{CUSTOM_SHORTCUT}-set-locals', 'env'])
+    assert "requires <key> <value>" in capsys.readouterr().out
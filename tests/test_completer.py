@@ -124,5 +124,17 @@ class TestDynamicAliasCompleter(unittest.TestCase):
         self.assertIn("sub1 ", res)
         self.assertNotIn("--opt ", res)
 
+    def test_09_context_memoized_per_token_prefix(self):
+        """Typing the last token reuses the context of the completed tokens"""
+        self.completer.reset_context_cache()
+        first = self.get_completions("complex val s")
+        ctx = self.completer._ctx_cache[("complex", "val")]
+        second = self.get_completions("complex val su")
+        self.assertIs(self.completer._ctx_cache[("complex", "val")], ctx)
+        self.assertIn("sub1 ", first)
+        self.assertIn("sub1 ", second)
+        self.completer.reset_context_cache()
+        self.assertEqual(len(self.completer._ctx_cache), 0)
+
 if __name__ == '__main__':
     unittest.main()
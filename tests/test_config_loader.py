@@ -0,0 +1,105 @@
+"""
+Config Loader Tests
+Test Rules:
+    @system_rules.txt
+    @global-test-rules.md
+"""
+import unittest
+import os
+import tempfile
+import sys
+from io import StringIO
+from unittest.mock import patch
+
+# Add src to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from dynamic_alias.config import ConfigLoader
+
+
+class TestConfigLoader(unittest.TestCase):
+    def _load(self, content: str) -> ConfigLoader:
+        with tempfile.NamedTemporaryFile(mode='w', delete=False, suffix='.yaml') as tmp:
+            tmp.write(content)
+            tmp_path = tmp.name
+        try:
+            loader = ConfigLoader(tmp_path)
+            with patch('sys.stdout', StringIO()):
+                loader.load()
+            return loader
+        finally:
+            os.remove(tmp_path)
+
+    def test_dya_yaml_blocks_loaded(self):
+        # Rule 1.1.4: Every block of tests/dya.yaml is parsed
+        loader = ConfigLoader(os.path.join(os.path.dirname(__file__), "dya.yaml"))
+        loader.load()
+        self.assertIn('static_envs', loader.dicts)
+        self.assertIn('dynamic_nodes', loader.dynamic_dicts)
+        self.assertIn('simple', [cmd.alias for cmd in loader.commands])
+
+    def test_dash_separator_inside_value(self):
+        # '---' inside a string value must not split the block
+        loader = self._load("""---
+type: command
+name: Separator
+alias: sep
+command: echo "a --- b"
+""")
+        self.assertEqual(len(loader.commands), 1)
+        self.assertEqual(loader.commands[0].command, 'echo "a --- b"')
+
+    def test_invalid_block_does_not_drop_valid_blocks(self):
+        # A malformed block is reported and skipped, the others still load
+        loader = self._load("""---
+type: command
+name: First
+alias: first
+command: echo first
+---
+type: command
+name: Broken
+alias: broken
+command: echo "x: ${y}"
+  bad: indent: here
+---
+type: dict
+name: envs
+data:
+  - name: dev
+""")
+        self.assertEqual([cmd.alias for cmd in loader.commands], ['first'])
+        self.assertIn('envs', loader.dicts)
+
+    def test_fallback_split_keeps_dash_separator_inside_value(self):
+        # Block-by-block recovery only splits on '---' lines
+        loader = self._load("""---
+type: command
+name: Quoted
+alias: quoted
+command: "echo a --- b"
+---
+type: command
+name: Broken
+alias: broken
+command: echo "x: ${y}"
+  bad: indent: here
+""")
+        self.assertEqual([cmd.command for cmd in loader.commands], ['echo a --- b'])
+
+    def test_env_vars_substituted_in_dict_data(self):
+        with patch.dict(os.environ, {'DYA_TEST_HOST': 'db.local'}):
+            loader = self._load("""---
+type: dict
+name: servers
+data:
+  - host: $${env.DYA_TEST_HOST}
+    port: 5432
+    label: plain
+""")
+        item = loader.dicts['servers'].data[0]
+        self.assertEqual(item, {'host': 'db.local', 'port': 5432, 'label': 'plain'})
+
+
+if __name__ == '__main__':
+    unittest.main()
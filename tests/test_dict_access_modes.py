@@ -290,6 +290,23 @@ class TestDictAccessModes(unittest.TestCase):
         self.assertIn("ora2", resolved, "Position 1 not resolved")
         self.assertIn("ora3", resolved, "Position 2 not resolved")
 
+    # =========================================================================
+    # List Mode Lookup Index
+    # =========================================================================
+
+    def test_find_item_first_match_and_rebuild(self):
+        """find_item returns the first matching item and follows replaced data."""
+        self.resolver.resolved_data['db_servers'] = [
+            {'name': 'ora1', 'host': 'a'},
+            {'name': 'ora1', 'host': 'b'},
+        ]
+        self.assertEqual(self.resolver.find_item('db_servers', 'name', 'ora1')['host'], 'a')
+        self.assertIsNone(self.resolver.find_item('db_servers', 'name', 'ora9'))
+
+        self.resolver.resolved_data['db_servers'] = [{'name': 'ora9', 'host': 'c'}]
+        self.assertEqual(self.resolver.find_item('db_servers', 'name', 'ora9')['host'], 'c')
+        self.assertIsNone(self.resolver.find_item('db_servers', 'name', 'ora1'))
+
 class TestTerminalReset(unittest.TestCase):
     """Test terminal reset functionality."""
     
@@ -0,0 +1,69 @@
+"""
+Root Command Dispatch Tests
+Test Rules:
+    @system_rules.txt
+    @global-test-rules.md
+"""
+import os
+import sys
+import unittest
+from unittest.mock import MagicMock
+
+# Add src to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from dynamic_alias.executor import CommandExecutor
+from dynamic_alias.models import CommandConfig
+from dynamic_alias.resolver import DataResolver
+
+
+class TestFindCommandDispatch(unittest.TestCase):
+    def setUp(self):
+        self.mock_resolver = MagicMock(spec=DataResolver)
+        self.mock_resolver.resolved_data = {}
+        self.mock_resolver.config = MagicMock()
+        self.executor = CommandExecutor(self.mock_resolver)
+
+    def test_static_head_dispatch(self):
+        self.mock_resolver.config.commands = [
+            CommandConfig(name="A", alias="alpha", command="echo a"),
+            CommandConfig(name="B", alias="beta run", command="echo b"),
+        ]
+        chain, _, _, _ = self.executor.find_command(["beta", "run"])
+        self.assertEqual(chain[0].name, "B")
+        self.assertIsNone(self.executor.find_command(["gamma"]))
+
+    def test_variable_head_keeps_config_order(self):
+        # A command starting with ${var} declared first still wins over a later static one
+        self.mock_resolver.config.commands = [
+            CommandConfig(name="Var", alias="${target}", command="echo ${target}"),
+            CommandConfig(name="Static", alias="alpha", command="echo a"),
+        ]
+        chain, variables, _, _ = self.executor.find_command(["alpha"])
+        self.assertEqual(chain[0].name, "Var")
+        self.assertEqual(variables["target"], "alpha")
+
+    def test_index_is_reused_until_invalidated(self):
+        self.mock_resolver.config.commands = [CommandConfig(name="A", alias="alpha", command="echo a")]
+        self.assertIsNotNone(self.executor.find_command(["alpha"]))
+        # Lookups don't re-scan config.commands; the index is built once
+        self.mock_resolver.config.commands = [CommandConfig(name="B", alias="beta", command="echo b")]
+        self.assertIsNone(self.executor.find_command(["beta"]))
+        self.executor.invalidate_index()
+        self.assertIsNone(self.executor.find_command(["alpha"]))
+        self.assertEqual(self.executor.find_command(["beta"])[0][0].name, "B")
+
+    def test_invalidate_after_in_place_edits(self):
+        commands = [CommandConfig(name="A", alias="alpha", command="echo a")]
+        self.mock_resolver.config.commands = commands
+        self.executor.find_command(["alpha"])
+        commands[0] = CommandConfig(name="B", alias="beta", command="echo b")
+        self.executor.invalidate_index()
+        self.assertEqual(self.executor.find_command(["beta"])[0][0].name, "B")
+        commands.clear()
+        self.executor.invalidate_index()
+        self.assertIsNone(self.executor.find_command(["beta"]))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -33,6 +33,7 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 's
 from dynamic_alias.config import ConfigLoader
 from dynamic_alias.cache import CacheManager
 from dynamic_alias.resolver import DataResolver
+from dynamic_alias.models import DynamicDictConfig
 import subprocess
 
 
@@ -236,6 +237,41 @@ class TestDynamicDictJsonValidation(unittest.TestCase):
             self.assertEqual(data, [])
             self.assertIn("permission denied", output.lower())
 
+    # =========================================================================
+    # Process Launch Tests
+    # =========================================================================
+    
+    def test_plain_command_runs_without_shell(self):
+        """A command without shell syntax is exec'd as argv."""
+        dd = DynamicDictConfig(name='plain', command='kubectl get pods -o json', mapping={'name': 'id'})
+        with patch('dynamic_alias.resolver.subprocess.run') as mock_run:
+            mock_run.return_value.stdout = '[{"id": "pod-1"}]'
+            mock_run.return_value.returncode = 0
+            data = self.resolver._execute_dynamic_source(dd)
+        
+        args, kwargs = mock_run.call_args
+        self.assertEqual(args[0], ['kubectl', 'get', 'pods', '-o', 'json'])
+        self.assertFalse(kwargs.get('shell', False))
+        self.assertEqual(kwargs.get('stdin'), subprocess.DEVNULL)
+        self.assertEqual(data, [{'name': 'pod-1'}])
+    
+    def test_shell_syntax_uses_shell(self):
+        """Pipes, variables and redirections still go through the shell."""
+        for command in ['kubectl get pods | jq .', 'echo $HOME', 'cat x > y', 'A=1 env']:
+            self.assertIsNone(DynamicDictConfig(name='s', command=command, mapping={}).argv, command)
+    
+    def test_missing_executable_falls_back_to_shell(self):
+        """Commands that are not executables on PATH are retried through the shell."""
+        dd = DynamicDictConfig(name='builtin', command='type ls', mapping={'name': 'id'})
+        ok = MagicMock(returncode=0, stdout='[{"id": "x"}]')
+        with patch('dynamic_alias.resolver.subprocess.run', side_effect=[FileNotFoundError(), ok]) as mock_run:
+            data = self.resolver._execute_dynamic_source(dd)
+        
+        args, kwargs = mock_run.call_args
+        self.assertEqual(args[0], 'type ls')
+        self.assertTrue(kwargs.get('shell'))
+        self.assertEqual(data, [{'name': 'x'}])
+
 
 if __name__ == '__main__':
     unittest.main()
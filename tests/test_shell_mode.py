@@ -146,5 +146,22 @@ command: echo test
         os.unlink(f.name)
 
 
+class TestShellInputSplit(unittest.TestCase):
+    """Test interactive input splitting."""
+    
+    def test_split_matches_shlex(self):
+        """Plain input takes the str.split path, quoted input the shlex path."""
+        import shlex
+        from dynamic_alias.utils import split_command_line
+        for text in ['pg db1  -o out', 'echo "a b" c', "it's'", 'a\\ b', 'a\xa0b', '']:
+            try:
+                expected = shlex.split(text)
+            except ValueError:
+                with self.assertRaises(ValueError):
+                    split_command_line(text)
+                continue
+            self.assertEqual(split_command_line(text), expected)
+
+
 if __name__ == '__main__':
     unittest.main()
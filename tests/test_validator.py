@@ -89,7 +89,26 @@ data:
             report = validator.validate()
             
             self.assertFalse(report.passed)
-            
+
+        os.unlink(f.name)
+
+    def test_dash_separator_inside_value(self):
+        """'---' inside a string value is not a block separator."""
+        with tempfile.NamedTemporaryFile(mode='w', suffix='.yaml', delete=False) as f:
+            f.write("""---
+type: command
+name: Separator
+alias: sep
+command: "echo a --- b"
+""")
+            f.flush()
+
+            validator = ConfigValidator(f.name)
+            report = validator.validate()
+
+            self.assertTrue(report.passed)
+            self.assertEqual(len(validator.commands), 1)
+
         os.unlink(f.name)
 
 
@@ -215,13 +234,37 @@ config:
             validator = ConfigValidator(f.name)
             report = validator.validate()
             
-            config_check = next((r for r in report.results 
+            config_check = next((r for r in report.results
                                 if "Unknown config keys" in r.message), None)
             self.assertIsNotNone(config_check)
             self.assertFalse(config_check.passed)
-            
+
         os.unlink(f.name)
 
+    def test_block_index_counts_comment_only_blocks(self):
+        """Comment-only blocks keep their position in the Block N numbering."""
+        for content, expected in (
+            ("---\n# disabled\n---\n# notes\n---\ntype: dict\nname: a\ndata:\n  - k: v\n"
+             "---\ntype: dict\nname: b\n", [3, 4]),
+            # Comment-only preamble and a blank document
+            ("# header\n---\ntype: dict\nname: a\ndata:\n  - k: v\n---\n---\n"
+             "type: dict\nname: b\n", [2, 3]),
+        ):
+            with tempfile.NamedTemporaryFile(mode='w', suffix='.yaml', delete=False) as f:
+                f.write(content)
+                f.flush()
+
+                validator = ConfigValidator(f.name)
+                report = validator.validate()
+
+                self.assertEqual([b['_block_index'] for b in validator.blocks], expected)
+                missing_check = next((r for r in report.results
+                                     if "missing required fields" in r.message), None)
+                self.assertIsNotNone(missing_check)
+                self.assertEqual(missing_check.location, f"Block {expected[1]}")
+
+            os.unlink(f.name)
+
 
 class TestValidatorReferences(unittest.TestCase):
     """Test undefined reference validation (Rule 1.1.15)."""